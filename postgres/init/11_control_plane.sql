@@ -138,6 +138,7 @@ CREATE TABLE IF NOT EXISTS metadata.bronze_event_tables (
   enabled BOOLEAN NOT NULL DEFAULT TRUE,
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  row_version BIGINT NOT NULL DEFAULT 0,
   UNIQUE (project_id, table_name),
   CONSTRAINT bronze_event_tables_project_fk
     FOREIGN KEY (project_id)
@@ -156,6 +157,7 @@ CREATE TABLE IF NOT EXISTS metadata.bronze_event_fields (
   ordinal INTEGER NOT NULL DEFAULT 0,
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  row_version BIGINT NOT NULL DEFAULT 0,
   UNIQUE (table_id, column_name),
   CONSTRAINT bronze_event_fields_table_fk
     FOREIGN KEY (table_id)
@@ -164,6 +166,12 @@ CREATE TABLE IF NOT EXISTS metadata.bronze_event_fields (
     ON DELETE CASCADE
 );
 
+ALTER TABLE metadata.bronze_event_tables
+  ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE metadata.bronze_event_fields
+  ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT 0;
+
 CREATE INDEX IF NOT EXISTS idx_ui_users_role
   ON metadata.ui_users (role);
 
@@ -182,6 +190,10 @@ CREATE INDEX IF NOT EXISTS idx_opensearch_sources_enabled
 CREATE INDEX IF NOT EXISTS idx_ingestion_state_status
   ON metadata.ingestion_state (status);
 
+CREATE INDEX IF NOT EXISTS idx_ingestion_state_idle_updated
+  ON metadata.ingestion_state (updated_at)
+  WHERE status = 'idle';
+
 CREATE INDEX IF NOT EXISTS idx_backfill_jobs_status
   ON metadata.backfill_jobs (status);
 
@@ -197,6 +209,10 @@ CREATE INDEX IF NOT EXISTS idx_bronze_event_tables_project
 CREATE INDEX IF NOT EXISTS idx_bronze_event_tables_enabled
   ON metadata.bronze_event_tables (enabled);
 
+CREATE INDEX IF NOT EXISTS idx_bronze_event_tables_project_active
+  ON metadata.bronze_event_tables (project_id)
+  WHERE enabled;
+
 CREATE INDEX IF NOT EXISTS idx_bronze_event_fields_table
   ON metadata.bronze_event_fields (table_id);
 
@@ -1,3 +1,5 @@
+import time
+
 import pandas as pd
 import streamlit as st
 
@@ -10,76 +12,130 @@ ui.require_auth()
 ui.sidebar()
 ui.header("ITSEC Datapipeline Manager", "Dashboard overview")
 
-
-def metric_card(label: str, value: str, caption: str = "", accent: str = "#38bdf8") -> None:
-    st.markdown(
-        f"""
-        <div class="itsec-card itsec-card--metric" style="border-left-color: {accent};">
-          <div class="itsec-muted">{label}</div>
-          <div class="itsec-metric">{value}</div>
-          <div class="itsec-metric-caption">{caption}</div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+PROJECT_IDS_MAX_AGE_SECONDS = 300
 
 
-project_count = db.fetch_one("SELECT COUNT(*) AS count FROM metadata.projects") or {"count": 0}
-source_enabled = db.fetch_one(
-    "SELECT COUNT(*) AS count FROM metadata.opensearch_sources WHERE enabled = TRUE"
-) or {"count": 0}
-backfill_active = db.fetch_one(
-    """
-    SELECT COUNT(*) AS count
-    FROM metadata.backfill_jobs
-    WHERE status IN ('pending', 'running')
-    """
-) or {"count": 0}
-last_status = db.fetch_one(
-    """
-    SELECT status, COUNT(*) AS count
-    FROM metadata.ingestion_state
-    GROUP BY status
-    ORDER BY count DESC
-    LIMIT 1
-    """
+_CARD_TPL = (
+    '<div class="itsec-card itsec-card--metric" style="border-left-color: %s;">'
+    '<div class="itsec-muted">%s</div>'
+    '<div class="itsec-metric">%s</div>'
+    '<div class="itsec-metric-caption">%s</div>'
+    "</div>"
 )
 
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    metric_card("Projects", str(project_count["count"]), "Total onboarded", "#38bdf8")
-with col2:
-    metric_card("Enabled Sources", str(source_enabled["count"]), "Active ingest targets", "#34d399")
-with col3:
-    metric_card("Active Backfills", str(backfill_active["count"]), "Queued or running", "#f59e0b")
-with col4:
-    status_label = last_status["status"] if last_status else "n/a"
-    metric_card("Last Ingestion Status", status_label, "Most common status", "#818cf8")
 
-st.markdown("### Ingestion Lag by Source")
-lag_rows = db.fetch_all(
+def metric_card(label: str, value: str, caption: str = "", accent: str = "#38bdf8") -> str:
+    return _CARD_TPL % (accent, label, value, caption)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_fetch_one(sql: str):
+    return db.fetch_one(sql)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_fetch_all(sql: str):
+    return db.fetch_all(sql)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_copy_frame(sql: str, parse_dates: tuple, dtypes: tuple = ()):
+    return db.copy_frame(sql, parse_dates=parse_dates, dtypes=dict(dtypes))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_clickhouse_columns(project_id: str, sql: str):
+    return clickhouse.query_columns(sql, params={"bronze_db": f"{project_id}_bronze"})
+
+
+pool = ui.query_executor()
+kpi_future = pool.submit(
+    _cached_fetch_one,
+    """
+    SELECT (SELECT COUNT(*) FROM metadata.projects) AS project_count,
+           (SELECT COUNT(*)
+            FROM metadata.opensearch_sources
+            WHERE enabled = TRUE) AS source_enabled,
+           (SELECT COUNT(*)
+            FROM metadata.backfill_jobs
+            WHERE status IN ('pending', 'running')) AS backfill_active,
+           (SELECT status
+            FROM metadata.ingestion_state
+            GROUP BY status
+            ORDER BY COUNT(*) DESC
+            LIMIT 1) AS last_status
+    """,
+)
+lag_future = pool.submit(
+    _cached_copy_frame,
     """
     SELECT s.project_id,
            s.name,
            i.last_ts,
            i.status,
-           i.updated_at
+           i.updated_at,
+           (EXTRACT(EPOCH FROM (now() - i.last_ts)) / 60.0)::double precision AS lag_minutes
     FROM metadata.opensearch_sources s
     LEFT JOIN metadata.ingestion_state i
       ON i.source_id = s.source_id
     ORDER BY s.project_id, s.name
+    """,
+    ("last_ts", "updated_at"),
+    (("lag_minutes", "float64"),),
+)
+project_cache = st.session_state.get("dashboard_project_ids")
+projects_future = None
+if st.session_state.get("dashboard_refresh_projects"):
+    projects_future = pool.submit(
+        db.fetch_all, "SELECT project_id FROM metadata.projects ORDER BY project_id"
+    )
+elif not project_cache or time.monotonic() - project_cache[0] > PROJECT_IDS_MAX_AGE_SECONDS:
+    projects_future = pool.submit(
+        _cached_fetch_all, "SELECT project_id FROM metadata.projects ORDER BY project_id"
+    )
+errors_ingestion_future = pool.submit(
+    _cached_copy_frame,
+    """
+    SELECT source_id, index_name, last_error, updated_at
+    FROM metadata.ingestion_state
+    WHERE last_error IS NOT NULL
+    ORDER BY updated_at DESC
+    LIMIT 10
+    """,
+    ("updated_at",),
+    (("source_id", "Int64"),),
+)
+errors_backfill_future = pool.submit(
+    _cached_copy_frame,
     """
+    SELECT job_id, source_id, last_error, updated_at
+    FROM metadata.backfill_jobs
+    WHERE last_error IS NOT NULL
+    ORDER BY updated_at DESC
+    LIMIT 10
+    """,
+    ("updated_at",),
+    (("job_id", "Int64"), ("source_id", "Int64")),
+)
+
+kpis = kpi_future.result() or {}
+
+st.markdown(
+    '<div class="itsec-metric-grid">'
+    + metric_card("Projects", str(kpis.get("project_count") or 0), "Total onboarded", "#38bdf8")
+    + metric_card("Enabled Sources", str(kpis.get("source_enabled") or 0), "Active ingest targets", "#34d399")
+    + metric_card("Active Backfills", str(kpis.get("backfill_active") or 0), "Queued or running", "#f59e0b")
+    + metric_card("Last Ingestion Status", kpis.get("last_status") or "n/a", "Most common status", "#818cf8")
+    + "</div>",
+    unsafe_allow_html=True,
 )
 
-if lag_rows:
-    now = ui.utc_now()
-    for row in lag_rows:
-        last_ts = row.get("last_ts")
-        row["lag_minutes"] = (
-            (now - last_ts).total_seconds() / 60.0 if last_ts else None
-        )
-    lag_df = pd.DataFrame(lag_rows)
-    chart_df = lag_df.dropna(subset=["lag_minutes"]).set_index("name")
+st.markdown("### Ingestion Lag by Source")
+lag_df = lag_future.result()
+
+if not lag_df.empty:
+    lag_df = lag_df.astype({"lag_minutes": "float32"}, copy=False)
+    chart_df = lag_df.loc[lag_df["lag_minutes"].notna(), ["name", "lag_minutes"]].set_index("name")
     if not chart_df.empty:
         st.bar_chart(chart_df["lag_minutes"])
     st.dataframe(
@@ -90,77 +146,63 @@ else:
     st.info("No ingestion state yet.")
 
 st.markdown("### Ingestion Trends (Last 24 Hours)")
-projects = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
-project_ids = [row["project_id"] for row in projects]
+if projects_future is not None:
+    project_ids = [row["project_id"] for row in projects_future.result()]
+    st.session_state["dashboard_project_ids"] = (time.monotonic(), project_ids)
+else:
+    project_ids = project_cache[1]
+last_project = st.session_state.get("dashboard_last_project")
 selected_project = st.selectbox(
-    "Project for ClickHouse metrics", options=project_ids or ["no-projects"]
+    "Project for ClickHouse metrics",
+    options=project_ids or ["no-projects"],
+    index=project_ids.index(last_project) if last_project in project_ids else 0,
 )
+st.session_state["dashboard_last_project"] = selected_project
+st.button("Refresh project list", key="dashboard_refresh_projects")
 
 if selected_project and selected_project != "no-projects":
+    hourly_future = pool.submit(
+        _cached_clickhouse_columns,
+        selected_project,
+        """
+        SELECT toStartOfHour(event_ts) AS hour,
+               count() AS events,
+               avg(dateDiff('minute', event_ts, ingested_at)) AS lag_minutes
+        FROM {bronze_db:Identifier}.os_events_raw
+        WHERE event_ts >= now() - INTERVAL 24 HOUR
+        GROUP BY hour
+        ORDER BY hour
+        """,
+    )
+    hourly_error = None
+    try:
+        hourly_df = pd.DataFrame(hourly_future.result())
+        if not hourly_df.empty:
+            hourly_df.index = pd.to_datetime(hourly_df.pop("hour"))
+    except Exception as exc:
+        hourly_df = pd.DataFrame()
+        hourly_error = exc
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**Events per Hour**")
-        try:
-            rows = clickhouse.query_rows(
-                f"""
-                SELECT toStartOfHour(event_ts) AS hour, count() AS events
-                FROM {selected_project}_bronze.os_events_raw
-                WHERE event_ts >= now() - INTERVAL 24 HOUR
-                GROUP BY hour
-                ORDER BY hour
-                """
-            )
-            if rows:
-                events_df = pd.DataFrame(rows)
-                events_df["hour"] = pd.to_datetime(events_df["hour"])
-                events_df = events_df.set_index("hour")
-                st.line_chart(events_df["events"])
-            else:
-                st.info("No events in the last 24 hours.")
-        except Exception as exc:
-            st.error(f"ClickHouse query failed: {exc}")
+        if hourly_error is not None:
+            st.error(f"ClickHouse query failed: {hourly_error}")
+        elif not hourly_df.empty:
+            st.line_chart(hourly_df["events"])
+        else:
+            st.info("No events in the last 24 hours.")
     with col2:
         st.markdown("**Ingestion Lag (minutes)**")
-        try:
-            lag_rows = clickhouse.query_rows(
-                f"""
-                SELECT toStartOfHour(ingested_at) AS hour,
-                       avg(dateDiff('minute', event_ts, ingested_at)) AS lag_minutes
-                FROM {selected_project}_bronze.os_events_raw
-                WHERE ingested_at >= now() - INTERVAL 24 HOUR
-                GROUP BY hour
-                ORDER BY hour
-                """
-            )
-            if lag_rows:
-                lag_df = pd.DataFrame(lag_rows)
-                lag_df["hour"] = pd.to_datetime(lag_df["hour"])
-                lag_df = lag_df.set_index("hour")
-                st.line_chart(lag_df["lag_minutes"])
-            else:
-                st.info("No lag data in the last 24 hours.")
-        except Exception as exc:
-            st.error(f"Lag query failed: {exc}")
+        if hourly_error is not None:
+            st.error(f"Lag query failed: {hourly_error}")
+        elif not hourly_df.empty:
+            st.line_chart(hourly_df["lag_minutes"])
+        else:
+            st.info("No lag data in the last 24 hours.")
 
 st.markdown("### Recent Errors")
-errors_ingestion = db.fetch_all(
-    """
-    SELECT source_id, index_name, last_error, updated_at
-    FROM metadata.ingestion_state
-    WHERE last_error IS NOT NULL
-    ORDER BY updated_at DESC
-    LIMIT 10
-    """
-)
-errors_backfill = db.fetch_all(
-    """
-    SELECT job_id, source_id, last_error, updated_at
-    FROM metadata.backfill_jobs
-    WHERE last_error IS NOT NULL
-    ORDER BY updated_at DESC
-    LIMIT 10
-    """
-)
+errors_ingestion = errors_ingestion_future.result()
+errors_backfill = errors_backfill_future.result()
 
 col_a, col_b = st.columns(2)
 with col_a:
@@ -0,0 +1,195 @@
+from types import MappingProxyType
+
+_DEFAULT_DATASETS = {
+    "suricata": {
+        "table_name": "suricata_events_raw",
+        "columns": (
+            ("event_id", "String", "__event_id"),
+            ("event_ts", "DateTime64(3, 'Asia/Jakarta')", "__event_ts"),
+            ("sensor_type", "Nullable(String)", "$.event.provider\n$.event.module"),
+            ("sensor_name", "Nullable(String)", "$.agent.name\n$.host.name\n$.node"),
+            ("event_type", "Nullable(String)", "$.event.dataset\n$.event.kind"),
+            ("severity", "Nullable(String)", "$.suricata.alert.severity\n$.event.severity"),
+            ("src_ip", "Nullable(IPv6)", "$.source.ip"),
+            ("dest_ip", "Nullable(IPv6)", "$.destination.ip"),
+            ("src_port", "Nullable(Int32)", "$.source.port"),
+            ("dest_port", "Nullable(Int32)", "$.destination.port"),
+            ("community_id", "Nullable(String)", "$.network.community_id"),
+            ("duration", "Nullable(Float64)", "$.event.duration"),
+            ("dest_mac", "Nullable(String)", "$.suricata.ether.dest_mac"),
+            ("src_mac", "Nullable(String)", "$.suricata.ether.src_mac"),
+            ("mac", "Nullable(String)", "$.related.mac[0]"),
+            ("latitude", "Nullable(Float64)", "$.source.geo.location.lat"),
+            ("longitude", "Nullable(Float64)", "$.source.geo.location.lon"),
+            ("country_name", "Nullable(String)", "$.source.geo.country_name"),
+            (
+                "protocol",
+                "Nullable(String)",
+                "$.network.application\n$.network.transport[0]\n$.network.protocol[0]\n$.protocol[0]",
+            ),
+            (
+                "bytes",
+                "Nullable(Int64)",
+                "$.totDataBytes\n$.network.bytes\n$.client.bytes\n$.server.bytes",
+            ),
+            (
+                "packets",
+                "Nullable(Int64)",
+                "$.network.packets\n$.client.packets\n$.server.packets",
+            ),
+            ("flow_id", "Nullable(String)", "$.suricata.flow_id"),
+            ("signature", "Nullable(String)", "$.rule.name\n$.suricata.alert.signature"),
+            ("signature_id", "Nullable(Int32)", "$.rule.id"),
+            ("category", "Nullable(String)", "$.rule.category[0]"),
+            ("alert_action", "Nullable(String)", "$.suricata.alert.action"),
+            ("http_url", "Nullable(String)", "$.suricata.http.url"),
+            ("tags", "Array(String)", "tags\nevent.severity_tags"),
+            ("message", "Nullable(String)", "message\n$.event.original\n$.rule.name"),
+            ("raw_data", "String", "__raw"),
+        ),
+    },
+    "wazuh": {
+        "table_name": "wazuh_events_raw",
+        "columns": (
+            ("event_id", "String", "__event_id"),
+            ("event_ts", "DateTime64(3, 'Asia/Jakarta')", "__event_ts"),
+            (
+                "event_ingested_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "$.event.ingested\n__ingested_at",
+            ),
+            (
+                "event_start_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "epoch_ms:$.event.start",
+            ),
+            (
+                "event_end_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "epoch_ms:$.event.end",
+            ),
+            ("event_dataset", "Nullable(String)", "$.event.dataset"),
+            ("event_kind", "Nullable(String)", "$.event.kind"),
+            ("event_module", "Nullable(String)", "$.event.module"),
+            ("event_provider", "Nullable(String)", "$.event.provider"),
+            ("agent_name", "Nullable(String)", "$.agent.name"),
+            ("agent_ip", "Nullable(IPv6)", "$.agent.ip"),
+            ("host_name", "Nullable(String)", "$.host.name"),
+            ("host_ip", "Nullable(IPv6)", "$.host.ip"),
+            ("rule_id", "Nullable(String)", "$.rule.id"),
+            ("rule_level", "Nullable(Int32)", "$.rule.level"),
+            ("rule_name", "Nullable(String)", "$.rule.name"),
+            ("rule_ruleset", "Nullable(String)", "$.rule.ruleset"),
+            ("tags", "Array(String)", "tags"),
+            ("message", "Nullable(String)", "message\n$.rule.name"),
+            ("raw_data", "String", "__raw"),
+        ),
+    },
+    "zeek": {
+        "table_name": "zeek_events_raw",
+        "columns": (
+            ("event_id", "String", "__event_id"),
+            ("event_ts", "DateTime64(3, 'Asia/Jakarta')", "__event_ts"),
+            (
+                "event_ingested_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "$.event.ingested\n__ingested_at",
+            ),
+            (
+                "event_start_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "epoch_ms:$.event.start",
+            ),
+            (
+                "event_end_ts",
+                "Nullable(DateTime64(3, 'Asia/Jakarta'))",
+                "epoch_ms:$.event.end",
+            ),
+            ("event_dataset", "Nullable(String)", "$.event.dataset"),
+            ("event_kind", "Nullable(String)", "$.event.kind"),
+            ("event_module", "Nullable(String)", "$.event.module"),
+            ("event_provider", "Nullable(String)", "$.event.provider"),
+            ("zeek_uid", "Nullable(String)", "$.zeek.uid\n$.event.id[0]"),
+            ("sensor_name", "Nullable(String)", "$.agent.name\n$.host.name\n$.node"),
+            ("src_ip", "Nullable(IPv6)", "$.source.ip"),
+            ("dest_ip", "Nullable(IPv6)", "$.destination.ip"),
+            ("src_port", "Nullable(Int32)", "$.source.port"),
+            ("dest_port", "Nullable(Int32)", "$.destination.port"),
+            (
+                "geo_latitude",
+                "Nullable(Float64)",
+                "$.source.geo.location.lat\n$.source.geo.latitude\n$.destination.geo.location.lat\n$.destination.geo.latitude",
+            ),
+            (
+                "geo_longitude",
+                "Nullable(Float64)",
+                "$.source.geo.location.lon\n$.source.geo.longitude\n$.destination.geo.location.lon\n$.destination.geo.longitude",
+            ),
+            (
+                "geo_country",
+                "Nullable(String)",
+                "$.source.geo.country_name\n$.source.geo.country_iso_code\n$.source.geo.country_code2\n$.source.geo.country_code3\n$.destination.geo.country_name\n$.destination.geo.country_iso_code\n$.destination.geo.country_code2\n$.destination.geo.country_code3",
+            ),
+            (
+                "geo_city_name",
+                "Nullable(String)",
+                "$.source.geo.city_name\n$.destination.geo.city_name",
+            ),
+            ("mac_address", "Nullable(String)", "$.source.mac[0]\n$.destination.mac[0]"),
+            (
+                "protocol",
+                "Nullable(String)",
+                "$.network.application\n$.network.transport[0]\n$.network.protocol[0]\n$.protocol[0]",
+            ),
+            ("application", "Nullable(String)", "$.network.application"),
+            ("network_type", "Nullable(String)", "$.network.type"),
+            ("direction", "Nullable(String)", "$.network.direction"),
+            ("community_id", "Nullable(String)", "$.network.community_id"),
+            (
+                "bytes",
+                "Nullable(Int64)",
+                "$.totDataBytes\n$.network.bytes\n$.source.bytes\n$.destination.bytes",
+            ),
+            (
+                "packets",
+                "Nullable(Int64)",
+                "$.network.packets\n$.source.packets\n$.destination.packets",
+            ),
+            ("orig_bytes", "Nullable(Int64)", "$.zeek.conn.orig_bytes\n$.zeek.conn.orig_ip_bytes"),
+            ("resp_bytes", "Nullable(Int64)", "$.zeek.conn.resp_bytes\n$.zeek.conn.resp_ip_bytes"),
+            ("orig_pkts", "Nullable(Int64)", "$.zeek.conn.orig_pkts"),
+            ("resp_pkts", "Nullable(Int64)", "$.zeek.conn.resp_pkts"),
+            ("conn_state", "Nullable(String)", "$.zeek.conn.conn_state"),
+            (
+                "conn_state_description",
+                "Nullable(String)",
+                "$.zeek.conn.conn_state_description",
+            ),
+            ("duration", "Nullable(Float64)", "$.zeek.conn.duration"),
+            ("history", "Nullable(String)", "$.zeek.conn.history"),
+            ("vlan_id", "Nullable(String)", "$.zeek.conn.vlan\n$.network.vlan.id[0]"),
+            ("tags", "Array(String)", "tags\nevent.category\nevent.severity_tags"),
+            ("domain", "Nullable(String)", "$.zeek.http.host\n$.zeek.dns.query\n$.zeek.ssl.server_name"),
+            (
+                "message",
+                "Nullable(String)",
+                "message\n$.event.original\n$.zeek.conn.conn_state_description",
+            ),
+            ("raw_data", "String", "__raw"),
+        ),
+    },
+}
+
+DEFAULT_DATASETS = MappingProxyType(
+    {name: MappingProxyType(spec) for name, spec in _DEFAULT_DATASETS.items()}
+)
+
+DEFAULT_FIELD_ROWS = MappingProxyType(
+    {
+        name: tuple(
+            (column_name, column_type, json_path, ordinal)
+            for ordinal, (column_name, column_type, json_path) in enumerate(spec["columns"], start=1)
+        )
+        for name, spec in _DEFAULT_DATASETS.items()
+    }
+)
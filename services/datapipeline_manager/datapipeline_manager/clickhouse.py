@@ -1,23 +1,59 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
+import orjson
 import requests
 
 from .config import CLICKHOUSE_HTTP_URL
 
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = "gzip"
 
-def query_json(sql: str, timeout: int = 20) -> Dict[str, Any]:
-    query = sql.strip()
-    if "FORMAT" not in query.upper():
-        query = f"{query}\nFORMAT JSON"
-    response = requests.post(
+
+def _post(query: str, timeout: int, stream: bool = False, **settings: Any) -> requests.Response:
+    response = _SESSION.post(
         CLICKHOUSE_HTTP_URL.rstrip("/") + "/",
-        params={"query": query},
+        params={"query": query, "enable_http_compression": 1, **settings},
         timeout=timeout,
+        stream=stream,
     )
     response.raise_for_status()
-    return response.json()
+    return response
+
+
+def query_json(sql: str, timeout: int = 20) -> Dict[str, Any]:
+    query = sql.strip()
+    if "FORMAT" not in query.upper():
+        query = f"{query}\nFORMAT JSON"
+    return orjson.loads(_post(query, timeout).content)
+
+
+def _query_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {f"param_{name}": value for name, value in (params or {}).items()}
+
+
+def query_stream(
+    sql: str, timeout: int = 20, params: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    query = sql.strip()
+    if "FORMAT" not in query.upper():
+        query = f"{query}\nFORMAT JSONEachRow"
+    with _post(query, timeout, stream=True, **_query_params(params)) as response:
+        for line in response.iter_lines():
+            if line:
+                yield orjson.loads(line)
+
 
+def query_rows(
+    sql: str, timeout: int = 20, params: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    return list(query_stream(sql, timeout=timeout, params=params))
 
-def query_rows(sql: str, timeout: int = 20) -> List[Dict[str, Any]]:
-    payload = query_json(sql, timeout=timeout)
-    return payload.get("data", [])
+
+def query_columns(
+    sql: str, timeout: int = 20, params: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Any]]:
+    query = f"{sql.strip()}\nFORMAT JSONColumns"
+    response = _post(
+        query, timeout, output_format_json_quote_64bit_integers=0, **_query_params(params)
+    )
+    return orjson.loads(response.content)
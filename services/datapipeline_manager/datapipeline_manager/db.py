@@ -1,20 +1,70 @@
+import atexit
+import io
+import threading
+from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
+import pandas as pd
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 
-from .config import POSTGRES_DSN
+from .config import POSTGRES_DSN, POSTGRES_POOL_MAX, POSTGRES_POOL_MIN
+
+
+class _Connection(psycopg2.extensions.connection):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: Set[str] = set()
+
+
+_POOL: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = psycopg2.pool.ThreadedConnectionPool(
+                    POSTGRES_POOL_MIN,
+                    POSTGRES_POOL_MAX,
+                    POSTGRES_DSN,
+                    connection_factory=_Connection,
+                )
+    return _POOL
+
+
+@atexit.register
+def close_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
 
 
 @contextmanager
 def connect():
-    conn = psycopg2.connect(POSTGRES_DSN)
-    conn.autocommit = True
+    pool = _get_pool()
+    conn = pool.getconn()
+    broken = False
     try:
+        conn.autocommit = True
         yield conn
+    except (psycopg2.InterfaceError, psycopg2.OperationalError):
+        broken = True
+        raise
     finally:
-        conn.close()
+        pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+def like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 def fetch_all(query: str, params: Optional[Iterable[Any]] = None) -> List[Dict[str, Any]]:
@@ -31,8 +81,69 @@ def fetch_one(query: str, params: Optional[Iterable[Any]] = None) -> Optional[Di
             return cur.fetchone()
 
 
+def fetch_many(queries: Sequence[str]) -> List[List[Dict[str, Any]]]:
+    with connect() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            results = []
+            for query in queries:
+                cur.execute(query)
+                results.append(list(cur.fetchall()))
+            return results
+
+
+def copy_frame(
+    query: str,
+    params: Optional[Iterable[Any]] = None,
+    parse_dates: Sequence[str] = (),
+    dtypes: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    buffer = io.StringIO()
+    with connect() as conn:
+        with conn.cursor() as cur:
+            select = cur.mogrify(query, params).decode("utf-8")
+            cur.copy_expert(
+                f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')", buffer
+            )
+    buffer.seek(0)
+    frame = pd.read_csv(
+        buffer,
+        dtype=defaultdict(lambda: str, dtypes or {}),
+        keep_default_na=False,
+        na_values=["\\N"],
+    )
+    for column in parse_dates:
+        frame[column] = pd.to_datetime(frame[column], utc=True)
+    return frame
+
+
 def execute(query: str, params: Optional[Iterable[Any]] = None) -> int:
     with connect() as conn:
         with conn.cursor() as cur:
             cur.execute(query, params or ())
             return cur.rowcount
+
+
+def _execute_prepared(cur, name: str, query: str, params: Sequence[Any]) -> None:
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {query}")
+        conn.prepared.add(name)
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", tuple(params))
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def prepared_fetch_one(name: str, query: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+    with connect() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            _execute_prepared(cur, name, query, params)
+            return cur.fetchone()
+
+
+def prepared_execute(name: str, query: str, params: Sequence[Any] = ()) -> int:
+    with connect() as conn:
+        with conn.cursor() as cur:
+            _execute_prepared(cur, name, query, params)
+            return cur.rowcount
@@ -1,5 +1,6 @@
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 import requests
 
 from .config import OPENSEARCH_VERIFY_SSL
@@ -30,20 +31,14 @@ def test_connection(
     try:
         response = session.get(
             url,
-            params={"format": "json", "h": "index,status"},
+            params={"format": "json", "h": "index", "expand_wildcards": "open"},
             timeout=timeout,
             verify=OPENSEARCH_VERIFY_SSL,
         )
         if response.status_code == 404:
             return False, "No indices matched the pattern.", []
         response.raise_for_status()
-        indices = []
-        for row in response.json():
-            if row.get("status") == "close":
-                continue
-            index_name = row.get("index")
-            if index_name:
-                indices.append(index_name)
+        indices = [row["index"] for row in orjson.loads(response.content) if row.get("index")]
         if not indices:
             return False, "No open indices found.", []
         return True, f"Found {len(indices)} indices.", indices
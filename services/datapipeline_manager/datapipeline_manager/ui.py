@@ -1,12 +1,18 @@
 ﻿import base64
+import functools
 import hashlib
 import hmac
 import json
 import os
+import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import streamlit as st
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from cryptography.fernet import Fernet, InvalidToken
 try:
     import extra_streamlit_components as stx
@@ -20,6 +26,11 @@ DEFAULT_PAGE = "Dashboard.py"
 ROLE_OPTIONS = ("viewer", "editor", "admin")
 ROLE_LEVELS = {"viewer": 1, "editor": 2, "admin": 3}
 _COOKIE_MANAGER_KEY = "itsec_cookie_manager"
+_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+_IDENT_TRANS = str.maketrans("", "", string.ascii_letters + string.digits + "_")
+URL_RE = re.compile(r"https?://\S+")
+INDEX_PATTERN_RE = re.compile(r'[^\s"\\/?<>|#]+')
+_QUERY_WORKERS = 4
 
 
 def _cookie_manager():
@@ -54,7 +65,7 @@ def _switch_page(page: str) -> bool:
     return False
 
 
-def inject_css(hide_sidebar: bool = False) -> None:
+def _render_css(hide_sidebar: bool) -> str:
     hide_css = ""
     if hide_sidebar:
         hide_css = """
@@ -62,8 +73,7 @@ def inject_css(hide_sidebar: bool = False) -> None:
         [data-testid="collapsedControl"] { display: none; }
         """
 
-    st.markdown(
-        f"""
+    return f"""
         <style>
           @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600&display=swap');
           :root {{
@@ -133,6 +143,12 @@ def inject_css(hide_sidebar: bool = False) -> None:
             border: 1px solid var(--itsec-border);
             box-shadow: 0 12px 24px rgba(2, 6, 23, 0.35);
           }}
+          .itsec-metric-grid {{
+            display: grid;
+            grid-template-columns: repeat(4, minmax(0, 1fr));
+            gap: 1rem;
+            margin-bottom: 1rem;
+          }}
           .itsec-card--metric {{
             border-left: 4px solid var(--itsec-accent);
             min-height: 110px;
@@ -279,9 +295,15 @@ def inject_css(hide_sidebar: bool = False) -> None:
           #MainMenu {{ visibility: hidden; }}
           footer {{ visibility: hidden; }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+_CSS_DEFAULT = _render_css(hide_sidebar=False)
+_CSS_HIDE_SIDEBAR = _render_css(hide_sidebar=True)
+
+
+def inject_css(hide_sidebar: bool = False) -> None:
+    st.markdown(_CSS_HIDE_SIDEBAR if hide_sidebar else _CSS_DEFAULT, unsafe_allow_html=True)
 
 
 def header(title: str, subtitle: Optional[str] = None) -> None:
@@ -346,13 +368,54 @@ def _clear_auth() -> None:
     st.session_state.pop("authenticated", None)
     st.session_state.pop("username", None)
     st.session_state.pop("role", None)
+    st.session_state.pop("auth_token", None)
+    st.session_state.pop("auth_expires_at", None)
     _clear_auth_cookie()
 
 
+def _session_signature(username: Optional[str], role: Optional[str], expires_at: int) -> str:
+    message = f"{username or ''}|{role or ''}|{expires_at}".encode("utf-8")
+    digest = hmac.new(_secret_key() or b"", message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode("utf-8")
+
+
+def _issue_session_token(username: Optional[str], role: Optional[str]) -> None:
+    expires_at = int(utc_now().timestamp()) + config.AUTH_TTL_SECONDS
+    st.session_state["auth_expires_at"] = expires_at
+    st.session_state["auth_token"] = _session_signature(username, role, expires_at)
+
+
+def _start_session(username: Optional[str], role: Optional[str]) -> None:
+    st.session_state["authenticated"] = True
+    st.session_state["username"] = username
+    st.session_state["role"] = role
+    _issue_session_token(username, role)
+
+
+def set_session_role(role: str) -> None:
+    st.session_state["role"] = role
+    _issue_session_token(st.session_state.get("username"), role)
+
+
 def is_authenticated() -> bool:
     if not config.UI_PASSWORD:
         return True
-    return bool(st.session_state.get("authenticated"))
+    if not st.session_state.get("authenticated"):
+        return False
+    token = st.session_state.get("auth_token")
+    expires_at = st.session_state.get("auth_expires_at")
+    if not token or expires_at is None:
+        return False
+    username = st.session_state.get("username")
+    role = st.session_state.get("role")
+    if not hmac.compare_digest(token, _session_signature(username, role, expires_at)):
+        return False
+    remaining = expires_at - utc_now().timestamp()
+    if remaining <= 0:
+        return False
+    if remaining < config.AUTH_TTL_SECONDS * 0.1:
+        _issue_session_token(username, role)
+    return True
 
 
 def login_page() -> None:
@@ -408,6 +471,41 @@ def parse_json(text: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def is_identifier(value: Optional[str]) -> bool:
+    return bool(value) and not value.translate(_IDENT_TRANS)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_secret_file(path: str, mtime_ns: int) -> str:
+    with open(path, "r", encoding="utf-8") as handle:
+        return handle.read().strip()
+
+
+def read_secret(secret_ref: Optional[str]) -> Optional[str]:
+    if not secret_ref:
+        return None
+    try:
+        return _read_secret_file(secret_ref, os.stat(secret_ref).st_mtime_ns)
+    except OSError:
+        return None
+
+
+@st.cache_resource
+def query_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=_QUERY_WORKERS)
+
+
+def remember_row(cache_key: str, row_id: Any, row: Dict[str, Any]) -> None:
+    st.session_state.setdefault(cache_key, {})[row_id] = row
+
+
+def fresh_row(cache_key: str, row_id: Any, row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    newer = st.session_state.get(cache_key, {}).get(row_id)
+    if newer and (row is None or newer["updated_at"] >= row["updated_at"]):
+        return newer
+    return row
+
+
 def _coerce_bytes(value: Any) -> Optional[bytes]:
     if value is None:
         return None
@@ -420,6 +518,7 @@ def _coerce_bytes(value: Any) -> Optional[bytes]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _secret_key() -> Optional[bytes]:
     key_material = os.getenv("ITSEC_SECRET_KEY") or config.UI_PASSWORD
     if not key_material:
@@ -428,6 +527,7 @@ def _secret_key() -> Optional[bytes]:
     return base64.urlsafe_b64encode(digest)
 
 
+@functools.lru_cache(maxsize=1)
 def _auth_fernet() -> Optional[Fernet]:
     key = _secret_key()
     if not key:
@@ -539,9 +639,7 @@ def _clear_auth_cookie() -> None:
 
 
 def _persist_auth(user: Dict[str, Any]) -> None:
-    st.session_state["authenticated"] = True
-    st.session_state["username"] = user.get("username")
-    st.session_state["role"] = user.get("role")
+    _start_session(user.get("username"), user.get("role"))
     token = _encode_auth_token(user)
     if token:
         _set_auth_cookie(token)
@@ -557,32 +655,30 @@ def _restore_auth_from_cookie() -> None:
     if not user:
         _clear_auth_cookie()
         return
-    st.session_state["authenticated"] = True
-    st.session_state["username"] = user.get("username")
-    st.session_state["role"] = user.get("role")
+    _start_session(user.get("username"), user.get("role"))
 
 
 def encrypt_secret(secret: str) -> Optional[bytes]:
     if not secret:
         return None
-    key = _secret_key()
-    if not key:
+    fernet = _auth_fernet()
+    if not fernet:
         return secret.encode("utf-8")
-    return Fernet(key).encrypt(secret.encode("utf-8"))
+    return fernet.encrypt(secret.encode("utf-8"))
 
 
 def decrypt_secret(secret_enc: Any) -> Optional[str]:
     blob = _coerce_bytes(secret_enc)
     if not blob:
         return None
-    key = _secret_key()
-    if not key:
+    fernet = _auth_fernet()
+    if not fernet:
         try:
             return blob.decode("utf-8")
         except UnicodeDecodeError:
             return None
     try:
-        return Fernet(key).decrypt(blob).decode("utf-8")
+        return fernet.decrypt(blob).decode("utf-8")
     except InvalidToken:
         try:
             return blob.decode("utf-8")
@@ -600,17 +696,11 @@ def _normalize_role(role: Optional[str]) -> str:
     return "viewer"
 
 
-def _hash_password(password: str, iterations: int = 260_000) -> str:
-    salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return "pbkdf2_sha256$%d$%s$%s" % (
-        iterations,
-        base64.b64encode(salt).decode("utf-8"),
-        base64.b64encode(dk).decode("utf-8"),
-    )
+def _hash_password(password: str) -> str:
+    return _PASSWORD_HASHER.hash(password)
 
 
-def _verify_password(password: str, stored_hash: str) -> bool:
+def _verify_legacy_password(password: str, stored_hash: str) -> bool:
     try:
         algo, iterations, salt_b64, hash_b64 = stored_hash.split("$", 3)
         if algo != "pbkdf2_sha256":
@@ -625,10 +715,30 @@ def _verify_password(password: str, stored_hash: str) -> bool:
         return False
 
 
+def _verify_password(password: str, stored_hash: str) -> bool:
+    if stored_hash.startswith("pbkdf2_sha256$"):
+        return _verify_legacy_password(password, stored_hash)
+    try:
+        return _PASSWORD_HASHER.verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def _needs_rehash(stored_hash: str) -> bool:
+    if stored_hash.startswith("pbkdf2_sha256$"):
+        return True
+    try:
+        return _PASSWORD_HASHER.check_needs_rehash(stored_hash)
+    except InvalidHashError:
+        return False
+
+
+@functools.lru_cache(maxsize=1)
 def ensure_user_store() -> None:
-    db.execute("CREATE SCHEMA IF NOT EXISTS metadata;")
     db.execute(
         """
+        SELECT pg_advisory_xact_lock(hashtext('metadata.ui_users'));
+        CREATE SCHEMA IF NOT EXISTS metadata;
         CREATE TABLE IF NOT EXISTS metadata.ui_users (
           user_id BIGSERIAL PRIMARY KEY,
           username TEXT NOT NULL UNIQUE,
@@ -643,16 +753,27 @@ def ensure_user_store() -> None:
 
 
 def _user_count() -> int:
-    row = db.fetch_one("SELECT COUNT(*) AS count FROM metadata.ui_users")
+    row = db.prepared_fetch_one(
+        "ui_user_count", "SELECT COUNT(*) AS count FROM metadata.ui_users"
+    )
+    return int(row["count"]) if row else 0
+
+
+def count_enabled_admins() -> int:
+    row = db.prepared_fetch_one(
+        "ui_enabled_admin_count",
+        "SELECT COUNT(*) AS count FROM metadata.ui_users WHERE role = 'admin' AND enabled",
+    )
     return int(row["count"]) if row else 0
 
 
 def get_user(username: str) -> Optional[Dict[str, Any]]:
-    return db.fetch_one(
+    return db.prepared_fetch_one(
+        "ui_get_user",
         """
         SELECT username, password_hash, role, enabled, created_at, updated_at
         FROM metadata.ui_users
-        WHERE username = %s
+        WHERE username = $1
         """,
         (username,),
     )
@@ -671,10 +792,11 @@ def list_users() -> list[Dict[str, Any]]:
 def create_user(username: str, password: str, role: str = "viewer", enabled: bool = True) -> None:
     role = _normalize_role(role)
     password_hash = _hash_password(password)
-    db.execute(
+    db.prepared_execute(
+        "ui_create_user",
         """
         INSERT INTO metadata.ui_users (username, password_hash, role, enabled, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, now(), now())
+        VALUES ($1, $2, $3, $4, now(), now())
         """,
         (username, password_hash, role, enabled),
     )
@@ -682,13 +804,14 @@ def create_user(username: str, password: str, role: str = "viewer", enabled: boo
 
 def update_user(username: str, role: str, enabled: bool) -> int:
     role = _normalize_role(role)
-    return db.execute(
+    return db.prepared_execute(
+        "ui_update_user",
         """
         UPDATE metadata.ui_users
-        SET role = %s,
-            enabled = %s,
+        SET role = $1,
+            enabled = $2,
             updated_at = now()
-        WHERE username = %s
+        WHERE username = $3
         """,
         (role, enabled, username),
     )
@@ -696,12 +819,13 @@ def update_user(username: str, role: str, enabled: bool) -> int:
 
 def reset_password(username: str, password: str) -> int:
     password_hash = _hash_password(password)
-    return db.execute(
+    return db.prepared_execute(
+        "ui_reset_password",
         """
         UPDATE metadata.ui_users
-        SET password_hash = %s,
+        SET password_hash = $1,
             updated_at = now()
-        WHERE username = %s
+        WHERE username = $2
         """,
         (password_hash, username),
     )
@@ -714,6 +838,8 @@ def authenticate_user(username: str, password: str) -> tuple[Optional[Dict[str,
         if not user["enabled"]:
             return None, "User is disabled."
         if _verify_password(password, user["password_hash"]):
+            if _needs_rehash(user["password_hash"]):
+                reset_password(username, password)
             return user, None
         return None, "Invalid credentials."
     if _user_count() == 0 and username == config.UI_USER and password == config.UI_PASSWORD:
@@ -10,37 +10,77 @@ ui.require_auth()
 ui.sidebar()
 ui.header("Projects", "Manage project catalog and retention")
 
-projects = db.fetch_all(
-    """
-    SELECT project_id, name, timezone, retention_days, enabled, created_at, updated_at
-    FROM metadata.projects
-    ORDER BY project_id
-    """
-)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_projects():
+    rows = db.fetch_all(
+        """
+        SELECT project_id, name, timezone, retention_days, enabled, updated_at
+        FROM metadata.projects
+        ORDER BY project_id
+        """
+    )
+    return [dict(row) for row in rows]
+
+
+_PROJECT_FILTERS = """
+    WHERE (%s = '' OR (project_id || ' ' || name) ILIKE %s)
+      AND (%s = 'all' OR enabled = %s)
+"""
+
+
+def _project_filter_params(search: str, status_filter: str):
+    return (search, db.like_pattern(search), status_filter, status_filter == "enabled")
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_projects(search: str, status_filter: str) -> int:
+    row = db.fetch_one(
+        "SELECT COUNT(*) AS count FROM metadata.projects" + _PROJECT_FILTERS,
+        _project_filter_params(search, status_filter),
+    )
+    return int(row["count"]) if row else 0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_projects(search: str, status_filter: str, limit: int, offset: int):
+    rows = db.fetch_all(
+        """
+        SELECT project_id, name, timezone, retention_days, enabled, updated_at
+        FROM metadata.projects
+        """
+        + _PROJECT_FILTERS
+        + """
+        ORDER BY project_id
+        LIMIT %s OFFSET %s
+        """,
+        _project_filter_params(search, status_filter) + (limit, offset),
+    )
+    return [dict(row) for row in rows]
+
+
+def _invalidate_projects() -> None:
+    _load_projects.clear()
+    _count_projects.clear()
+    _search_projects.clear()
+
+
+projects = _load_projects()
+projects_by_id = {
+    row["project_id"]: ui.fresh_row("projects_cache", row["project_id"], row) for row in projects
+}
 
 st.markdown("### Project List")
 search = st.text_input("Search by project_id or name", value="")
 status_filter = st.selectbox("Filter by status", ["all", "enabled", "disabled"], index=0)
 
-filtered = []
-for row in projects:
-    match = search.lower() in (row["project_id"] + " " + row["name"]).lower()
-    status_ok = (
-        status_filter == "all"
-        or (status_filter == "enabled" and row["enabled"])
-        or (status_filter == "disabled" and not row["enabled"])
-    )
-    if match and status_ok:
-        filtered.append(row)
-
-df = pd.DataFrame(filtered)
+total = _count_projects(search, status_filter)
 page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
-total_pages = max(1, (len(df) + page_size - 1) // page_size)
+total_pages = max(1, (total + page_size - 1) // page_size)
 page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
-start = (page - 1) * page_size
-end = start + page_size
+page_rows = _search_projects(search, status_filter, page_size, (page - 1) * page_size)
 
-st.dataframe(df.iloc[start:end] if not df.empty else df, use_container_width=True)
+st.dataframe(pd.DataFrame(page_rows), height=400, use_container_width=True)
 
 st.markdown("### Create Project")
 st.caption("Project ID is used to create ClickHouse databases: <project_id>_bronze and <project_id>_gold.")
@@ -52,7 +92,7 @@ with st.form("create_project"):
     enabled = st.checkbox("Enabled", value=True)
     submitted = st.form_submit_button("Create Project")
     if submitted:
-        if not project_id or not project_id.replace("_", "").isalnum():
+        if not ui.is_identifier(project_id):
             st.error("Project ID must be alphanumeric + underscore.")
         elif not name:
             st.error("Project name is required.")
@@ -66,6 +106,7 @@ with st.form("create_project"):
                     """,
                     (project_id, name, timezone, retention_days, enabled),
                 )
+                _invalidate_projects()
                 ui.notify("Project created.")
                 st.rerun()
             except Exception as exc:
@@ -74,7 +115,7 @@ with st.form("create_project"):
 st.markdown("### Edit / Enable / Disable")
 project_ids = [row["project_id"] for row in projects]
 selected = st.selectbox("Select project", options=project_ids or ["no-projects"])
-current = next((row for row in projects if row["project_id"] == selected), None)
+current = projects_by_id.get(selected)
 
 if current:
     with st.form("edit_project"):
@@ -87,16 +128,18 @@ if current:
         submitted = st.form_submit_button("Update Project")
         if submitted:
             try:
-                rowcount = db.execute(
+                updated = db.prepared_fetch_one(
+                    "projects_update",
                     """
                     UPDATE metadata.projects
-                    SET name = %s,
-                        timezone = %s,
-                        retention_days = %s,
-                        enabled = %s,
+                    SET name = $1,
+                        timezone = $2,
+                        retention_days = $3,
+                        enabled = $4,
                         updated_at = now()
-                    WHERE project_id = %s
-                      AND updated_at = %s
+                    WHERE project_id = $5
+                      AND updated_at = $6
+                    RETURNING project_id, name, timezone, retention_days, enabled, updated_at
                     """,
                     (
                         name,
@@ -107,9 +150,12 @@ if current:
                         current["updated_at"],
                     ),
                 )
-                if rowcount == 0:
+                if updated is None:
                     st.error("Update conflict: project was modified by another user.")
                 else:
+                    ui.remember_row("projects_cache", updated["project_id"], dict(updated))
+                    _count_projects.clear()
+                    _search_projects.clear()
                     ui.notify("Project updated.")
                     st.rerun()
             except Exception as exc:
@@ -1,9 +1,8 @@
-import json
-from typing import Optional
-
+import orjson
 import pandas as pd
 import psycopg2
 import streamlit as st
+from psycopg2.extras import Json
 
 from datapipeline_manager import db, opensearch, ui
 
@@ -15,39 +14,191 @@ ui.sidebar()
 ui.header("OpenSearch Sources", "Onboard and manage data sources")
 
 
-def _read_secret(secret_ref: Optional[str]) -> Optional[str]:
-    if not secret_ref:
-        return None
-    try:
-        with open(secret_ref, "r", encoding="utf-8") as handle:
-            return handle.read().strip()
-    except OSError:
+def _plain_source_row(row):
+    row = dict(row)
+    if row["secret_enc"] is not None:
+        row["secret_enc"] = bytes(row["secret_enc"])
+    return row
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_catalog():
+    rows = db.fetch_all(
+        """
+        SELECT p.project_id, s.source_id
+        FROM metadata.projects p
+        LEFT JOIN metadata.opensearch_sources s
+          ON s.project_id = p.project_id
+        ORDER BY p.project_id, s.source_id
+        """
+    )
+    project_ids = []
+    source_ids = []
+    for row in rows:
+        if not project_ids or project_ids[-1] != row["project_id"]:
+            project_ids.append(row["project_id"])
+        if row["source_id"] is not None:
+            source_ids.append(row["source_id"])
+    source_ids.sort()
+    return project_ids, source_ids
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_source(source_id: int):
+    row = db.fetch_one(
+        """
+        SELECT source_id, project_id, name, base_url, auth_type, username, secret_ref, secret_enc,
+               index_pattern, time_field, query_filter_json, enabled, created_at, updated_at
+        FROM metadata.opensearch_sources
+        WHERE source_id = %s
+        """,
+        (source_id,),
+    )
+    return _plain_source_row(row) if row else None
+
+
+def _current_source(selected: str):
+    if not selected.isdigit():
         return None
+    source_id = int(selected)
+    return ui.fresh_row("sources_cache", source_id, _load_source(source_id))
+
+
+_SOURCE_FILTERS = """
+    WHERE (%s = '' OR (name || ' ' || base_url) ILIKE %s)
+      AND (%s = 'all' OR project_id = %s)
+      AND (%s = 'all' OR enabled = %s)
+"""
+
+
+def _source_filter_params(search: str, project_filter: str, status_filter: str):
+    return (
+        search,
+        db.like_pattern(search),
+        project_filter,
+        project_filter,
+        status_filter,
+        status_filter == "enabled",
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_sources(search: str, project_filter: str, status_filter: str) -> int:
+    row = db.fetch_one(
+        "SELECT COUNT(*) AS count FROM metadata.opensearch_sources" + _SOURCE_FILTERS,
+        _source_filter_params(search, project_filter, status_filter),
+    )
+    return int(row["count"]) if row else 0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_sources(search: str, project_filter: str, status_filter: str, limit: int, offset: int):
+    rows = db.fetch_all(
+        """
+        SELECT source_id, project_id, name, base_url, auth_type, enabled, updated_at
+        FROM metadata.opensearch_sources
+        """
+        + _SOURCE_FILTERS
+        + """
+        ORDER BY source_id
+        LIMIT %s OFFSET %s
+        """,
+        _source_filter_params(search, project_filter, status_filter) + (limit, offset),
+    )
+    return [dict(row) for row in rows]
+
+
+def _invalidate_sources() -> None:
+    _load_catalog.clear()
+    _load_source.clear()
+    _count_sources.clear()
+    _search_sources.clear()
+
+
+@st.fragment
+def _source_list(project_ids) -> None:
+    st.markdown("### Sources")
+    search = st.text_input("Search by name or base URL", value="")
+    project_filter = st.selectbox(
+        "Filter by project", options=["all"] + project_ids, index=0
+    )
+    status_filter = st.selectbox("Filter by status", ["all", "enabled", "disabled"], index=0)
+
+    total = _count_sources(search, project_filter, status_filter)
+    page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
+    total_pages = max(1, (total + page_size - 1) // page_size)
+    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="source_page")
+    filtered = _search_sources(
+        search, project_filter, status_filter, page_size, (page - 1) * page_size
+    )
+    st.dataframe(pd.DataFrame(filtered), height=400, use_container_width=True)
 
+    st.markdown("### Actions")
+    selected = st.selectbox(
+        "Select source", options=[str(row["source_id"]) for row in filtered] or ["none"]
+    )
+    current = _current_source(selected)
+    if current:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("Enable / Disable"):
+                confirm = st.checkbox("Confirm status change", key="confirm_toggle")
+                if confirm:
+                    new_status = not current["enabled"]
+                    updated = db.prepared_fetch_one(
+                        "sources_set_enabled",
+                        """
+                        UPDATE metadata.opensearch_sources
+                        SET enabled = $1,
+                            updated_at = now()
+                        WHERE source_id = $2
+                          AND updated_at = $3
+                        RETURNING source_id, project_id, name, base_url, auth_type, username, secret_ref,
+                                  secret_enc, index_pattern, time_field, query_filter_json, enabled,
+                                  created_at, updated_at
+                        """,
+                        (new_status, current["source_id"], current["updated_at"]),
+                    )
+                    if updated is None:
+                        st.error("Update conflict: source was modified by another user.")
+                    else:
+                        ui.remember_row("sources_cache", updated["source_id"], _plain_source_row(updated))
+                        _count_sources.clear()
+                        _search_sources.clear()
+                        ui.notify("Source status updated.")
+                        st.rerun()
+        with col2:
+            if st.button("Test Connection"):
+                secret_value = ui.read_secret(current.get("secret_ref"))
+                if not secret_value:
+                    secret_value = ui.decrypt_secret(current.get("secret_enc"))
+                ok, message, indices = opensearch.test_connection(
+                    base_url=current["base_url"],
+                    index_pattern=current["index_pattern"],
+                    auth_type=current.get("auth_type"),
+                    username=current.get("username"),
+                    secret=secret_value,
+                )
+                if ok:
+                    ui.notify(message, "success")
+                    st.write(indices)
+                else:
+                    st.error(message)
+        with col3:
+            if st.button("View Details"):
+                st.json(current)
+            else:
+                st.write("Use the wizard above to edit details.")
 
-projects = db.fetch_all(
-    "SELECT project_id FROM metadata.projects ORDER BY project_id"
-)
-project_ids = [row["project_id"] for row in projects]
 
-sources = db.fetch_all(
-    """
-    SELECT source_id, project_id, name, base_url, auth_type, username, secret_ref, secret_enc,
-           index_pattern, time_field, query_filter_json, enabled, created_at, updated_at
-    FROM metadata.opensearch_sources
-    ORDER BY source_id
-    """
-)
+project_ids, source_ids = _load_catalog()
 
 tabs = st.tabs(["Add / Edit", "Source List"])
 
 with tabs[0]:
     st.markdown("### Source Wizard")
-    source_ids = ["new"] + [str(row["source_id"]) for row in sources]
-    selected_id = st.selectbox("Select source to edit", source_ids)
-    current = next(
-        (row for row in sources if str(row["source_id"]) == selected_id), None
-    )
+    selected_id = st.selectbox("Select source to edit", ["new"] + [str(source_id) for source_id in source_ids])
+    current = _current_source(selected_id)
 
     with st.form("source_form"):
         project_id = st.selectbox(
@@ -113,7 +264,11 @@ with tabs[0]:
         with st.expander("Step 3: Filters", expanded=False):
             query_filter_json = st.text_area(
                 "Query Filter JSON",
-                value=json.dumps(current["query_filter_json"] or {}, indent=2) if current else "{}",
+                value=(
+                    orjson.dumps(current["query_filter_json"] or {}, option=orjson.OPT_INDENT_2).decode()
+                    if current
+                    else "{}"
+                ),
                 height=80,
             )
 
@@ -133,10 +288,12 @@ with tabs[0]:
             if auth_type != "none":
                 if secret_mode == "stored":
                     secret_value = secret or (
-                        ui.decrypt_secret(current.get("secret_enc")) if current else None
+                        ui.decrypt_secret(current.get("secret_enc"))
+                        if current
+                        else None
                     )
                 else:
-                    secret_value = _read_secret(secret_ref)
+                    secret_value = ui.read_secret(secret_ref)
             if auth_type != "none" and not secret_value:
                 label = "Password" if auth_type == "basic" else "Secret"
                 st.error(f"{label} is required for the selected auth type.")
@@ -159,6 +316,10 @@ with tabs[0]:
             st.error("Query filter JSON is invalid.")
         elif not name or not base_url or not index_pattern or not time_field:
             st.error("Name, base URL, index pattern, and time field are required.")
+        elif not ui.URL_RE.fullmatch(base_url):
+            st.error("Base URL must start with http:// or https:// and contain no spaces.")
+        elif not ui.INDEX_PATTERN_RE.fullmatch(index_pattern):
+            st.error("Index pattern contains characters OpenSearch does not allow.")
         elif auth_type != "none" and secret_mode == "secret_ref" and not secret_ref:
             st.error("Secret ref is required for the selected auth type.")
         elif auth_type != "none" and secret_mode == "stored" and not secret and not (current and current.get("secret_enc")):
@@ -183,23 +344,27 @@ with tabs[0]:
             )
             try:
                 if current:
-                    rowcount = db.execute(
+                    updated = db.prepared_fetch_one(
+                        "sources_update",
                         """
                         UPDATE metadata.opensearch_sources
-                        SET project_id = %s,
-                            name = %s,
-                            base_url = %s,
-                            auth_type = %s,
-                            username = %s,
-                            secret_ref = %s,
-                            secret_enc = %s,
-                            index_pattern = %s,
-                            time_field = %s,
-                            query_filter_json = %s,
-                            enabled = %s,
+                        SET project_id = $1,
+                            name = $2,
+                            base_url = $3,
+                            auth_type = $4,
+                            username = $5,
+                            secret_ref = $6,
+                            secret_enc = $7,
+                            index_pattern = $8,
+                            time_field = $9,
+                            query_filter_json = $10,
+                            enabled = $11,
                             updated_at = now()
-                        WHERE source_id = %s
-                          AND updated_at = %s
+                        WHERE source_id = $12
+                          AND updated_at = $13
+                        RETURNING source_id, project_id, name, base_url, auth_type, username, secret_ref,
+                                  secret_enc, index_pattern, time_field, query_filter_json, enabled,
+                                  created_at, updated_at
                         """,
                         (
                             project_id,
@@ -211,15 +376,18 @@ with tabs[0]:
                             secret_enc_param,
                             index_pattern,
                             time_field,
-                            json.dumps(query_filter),
+                            Json(query_filter),
                             enabled,
                             current["source_id"],
                             current["updated_at"],
                         ),
                     )
-                    if rowcount == 0:
+                    if updated is None:
                         st.error("Update conflict: source was modified by another user.")
                     else:
+                        ui.remember_row("sources_cache", updated["source_id"], _plain_source_row(updated))
+                        _count_sources.clear()
+                        _search_sources.clear()
                         ui.notify("Source updated.")
                         st.rerun()
                 else:
@@ -240,89 +408,15 @@ with tabs[0]:
                             secret_enc_param,
                             index_pattern,
                             time_field,
-                            json.dumps(query_filter),
+                            Json(query_filter),
                             enabled,
                         ),
                     )
+                    _invalidate_sources()
                     ui.notify("Source created.")
                     st.rerun()
             except Exception as exc:
                 st.error(f"Save failed: {exc}")
 
 with tabs[1]:
-    st.markdown("### Sources")
-    search = st.text_input("Search by name or base URL", value="")
-    project_filter = st.selectbox(
-        "Filter by project", options=["all"] + project_ids, index=0
-    )
-    status_filter = st.selectbox("Filter by status", ["all", "enabled", "disabled"], index=0)
-
-    filtered = []
-    for row in sources:
-        match = search.lower() in (row["name"] + " " + row["base_url"]).lower()
-        project_ok = project_filter == "all" or row["project_id"] == project_filter
-        status_ok = (
-            status_filter == "all"
-            or (status_filter == "enabled" and row["enabled"])
-            or (status_filter == "disabled" and not row["enabled"])
-        )
-        if match and project_ok and status_ok:
-            filtered.append(row)
-
-    df = pd.DataFrame(filtered)
-    page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
-    total_pages = max(1, (len(df) + page_size - 1) // page_size)
-    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="source_page")
-    start = (page - 1) * page_size
-    end = start + page_size
-    st.dataframe(df.iloc[start:end] if not df.empty else df, use_container_width=True)
-
-    st.markdown("### Actions")
-    selected = st.selectbox(
-        "Select source", options=[str(row["source_id"]) for row in filtered] or ["none"]
-    )
-    current = next((row for row in sources if str(row["source_id"]) == selected), None)
-    if current:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            if st.button("Enable / Disable"):
-                confirm = st.checkbox("Confirm status change", key="confirm_toggle")
-                if confirm:
-                    new_status = not current["enabled"]
-                    rowcount = db.execute(
-                        """
-                        UPDATE metadata.opensearch_sources
-                        SET enabled = %s,
-                            updated_at = now()
-                        WHERE source_id = %s
-                          AND updated_at = %s
-                        """,
-                        (new_status, current["source_id"], current["updated_at"]),
-                    )
-                    if rowcount == 0:
-                        st.error("Update conflict: source was modified by another user.")
-                    else:
-                        ui.notify("Source status updated.")
-                        st.rerun()
-        with col2:
-            if st.button("Test Connection"):
-                secret_value = _read_secret(current.get("secret_ref"))
-                if not secret_value:
-                    secret_value = ui.decrypt_secret(current.get("secret_enc"))
-                ok, message, indices = opensearch.test_connection(
-                    base_url=current["base_url"],
-                    index_pattern=current["index_pattern"],
-                    auth_type=current.get("auth_type"),
-                    username=current.get("username"),
-                    secret=secret_value,
-                )
-                if ok:
-                    ui.notify(message, "success")
-                    st.write(indices)
-                else:
-                    st.error(message)
-        with col3:
-            if st.button("View Details"):
-                st.json(current)
-            else:
-                st.write("Use the wizard above to edit details.")
+    _source_list(project_ids)
@@ -1,10 +1,9 @@
-import json
-import re
-from typing import Optional
+from types import MappingProxyType
 
 import pandas as pd
 import psycopg2
 import streamlit as st
+from psycopg2.extras import Json
 
 from datapipeline_manager import clickhouse, db, opensearch, ui
 
@@ -16,70 +15,168 @@ ui.sidebar()
 ui.header("OpenSearch Puller", "Onboard sources, configure ingestion, and monitor health")
 
 
-DEFAULT_CONFIG = {
-    "poll_interval_seconds": 30,
-    "overlap_minutes": 10,
-    "batch_size": 500,
-    "max_retries": 3,
-    "backoff_base_seconds": 1.0,
-    "rate_limit_seconds": 0.0,
-    "opensearch_timeout_seconds": 30,
-    "clickhouse_timeout_seconds": 30,
-    "opensearch_verify_ssl": True,
-}
+AUTH_OPTIONS = ("none", "basic", "api_key", "bearer")
+DEFAULT_CONFIG = MappingProxyType(
+    {
+        "poll_interval_seconds": 30,
+        "overlap_minutes": 10,
+        "batch_size": 500,
+        "max_retries": 3,
+        "backoff_base_seconds": 1.0,
+        "rate_limit_seconds": 0.0,
+        "opensearch_timeout_seconds": 30,
+        "clickhouse_timeout_seconds": 30,
+        "opensearch_verify_ssl": True,
+    }
+)
+
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_puller_config():
+    row = db.fetch_one(
+        """
+        SELECT poll_interval_seconds,
+               overlap_minutes,
+               batch_size,
+               max_retries,
+               backoff_base_seconds,
+               rate_limit_seconds,
+               opensearch_timeout_seconds,
+               clickhouse_timeout_seconds,
+               opensearch_verify_ssl,
+               updated_by,
+               updated_at
+        FROM metadata.opensearch_puller_config
+        ORDER BY updated_at DESC
+        LIMIT 1
+        """
+    )
+    return dict(row) if row else None
 
-def _read_secret(secret_ref: Optional[str]) -> Optional[str]:
-    if not secret_ref:
-        return None
+
+def _fetch_puller_config():
     try:
-        with open(secret_ref, "r", encoding="utf-8") as handle:
-            return handle.read().strip()
-    except OSError:
-        return None
+        return _load_puller_config(), None
+    except Exception as exc:
+        return None, exc
 
 
-def _is_safe_identifier(value: str) -> bool:
-    return bool(re.match(r"^[A-Za-z0-9_]+$", value or ""))
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_catalog():
+    projects, sources = db.fetch_many(
+        [
+            "SELECT project_id FROM metadata.projects ORDER BY project_id",
+            """
+            SELECT source_id, project_id, name, base_url, auth_type, username, secret_ref,
+                   index_pattern, time_field, query_filter_json, enabled, created_at, updated_at
+            FROM metadata.opensearch_sources
+            ORDER BY source_id
+            """,
+        ]
+    )
+    return [row["project_id"] for row in projects], [dict(row) for row in sources]
+
+
+_INGESTION_COLS = (
+    "source_id",
+    "project_id",
+    "name",
+    "enabled",
+    "index_name",
+    "last_ts",
+    "updated_at",
+    "status",
+    "last_error",
+)
 
 
-def _fetch_puller_config():
-    try:
-        return db.fetch_one(
+@st.cache_data(ttl=15, show_spinner=False)
+def _load_monitoring_bundle():
+    heartbeats, source_counts, ingestion_rows, backfill_rows = db.fetch_many(
+        [
             """
-            SELECT poll_interval_seconds,
-                   overlap_minutes,
-                   batch_size,
-                   max_retries,
-                   backoff_base_seconds,
-                   rate_limit_seconds,
-                   opensearch_timeout_seconds,
-                   clickhouse_timeout_seconds,
-                   opensearch_verify_ssl,
-                   updated_by,
-                   updated_at
-            FROM metadata.opensearch_puller_config
-            ORDER BY updated_at DESC
+            SELECT worker_id, worker_type, last_seen, status, details
+            FROM metadata.worker_heartbeats
+            WHERE worker_type = 'opensearch_puller'
+            ORDER BY last_seen DESC
             LIMIT 1
+            """,
             """
-        ), None
-    except Exception as exc:
-        return None, exc
+            SELECT count(*) AS total_sources,
+                   count(*) FILTER (WHERE enabled) AS enabled_sources
+            FROM metadata.opensearch_sources
+            """,
+            """
+            SELECT s.source_id,
+                   s.project_id,
+                   s.name,
+                   s.enabled,
+                   i.index_name,
+                   i.last_ts,
+                   i.updated_at,
+                   i.status,
+                   i.last_error
+            FROM metadata.opensearch_sources s
+            LEFT JOIN metadata.ingestion_state i
+              ON i.source_id = s.source_id
+            ORDER BY s.project_id, s.name, i.index_name
+            """,
+            """
+            SELECT job_id, source_id, start_ts, end_ts, status, last_error, updated_at
+            FROM metadata.backfill_jobs
+            ORDER BY updated_at DESC
+            LIMIT 50
+            """,
+        ]
+    )
+    return {
+        "heartbeat": dict(heartbeats[0]) if heartbeats else None,
+        "source_counts": dict(source_counts[0]),
+        "ingestion_rows": [dict(row) for row in ingestion_rows],
+        "backfill_rows": [dict(row) for row in backfill_rows],
+    }
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_clickhouse_activity(project_id: str):
+    params = {"bronze_db": f"{project_id}_bronze"}
+    per_source = clickhouse.query_rows(
+        """
+        SELECT source_id,
+               count() AS events_last_hour,
+               max(event_ts) AS last_event_ts
+        FROM {bronze_db:Identifier}.os_events_raw
+        WHERE event_ts >= now() - INTERVAL 1 HOUR
+        GROUP BY source_id
+        ORDER BY events_last_hour DESC
+        """,
+        params=params,
+    )
+    events_last_hour = sum(int(row["events_last_hour"]) for row in per_source)
 
+    rows = clickhouse.query_rows(
+        """
+        SELECT max(event_ts) AS last_event_ts
+        FROM {bronze_db:Identifier}.os_events_raw
+        """,
+        params=params,
+    )
+    last_event_ts = rows[0]["last_event_ts"] if rows else None
+    return events_last_hour, last_event_ts, per_source
 
-projects = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
-project_ids = [row["project_id"] for row in projects]
 
-sources = db.fetch_all(
-    """
-    SELECT source_id, project_id, name, base_url, auth_type, username, secret_ref, secret_enc,
-           index_pattern, time_field, query_filter_json, enabled, created_at, updated_at
-    FROM metadata.opensearch_sources
-    ORDER BY source_id
-    """
-)
+def _invalidate_puller() -> None:
+    _load_catalog.clear()
+    _load_puller_config.clear()
+    _load_monitoring_bundle.clear()
+    _load_clickhouse_activity.clear()
 
 
+if st.button("Refresh"):
+    _invalidate_puller()
+
+project_ids, sources = _load_catalog()
+
 tabs = st.tabs(["Add Source", "Puller Config", "Monitoring"])
 
 with tabs[0]:
@@ -93,10 +190,9 @@ with tabs[0]:
         )
         name = st.text_input("Source Name", value="")
 
-        auth_options = ["none", "basic", "api_key", "bearer"]
         with st.expander("Step 1: Connection", expanded=True):
             base_url = st.text_input("Base URL", value="")
-            auth_type = st.selectbox("Auth Type", options=auth_options, index=0)
+            auth_type = st.selectbox("Auth Type", options=AUTH_OPTIONS, index=0)
             username = st.text_input("Username", value="")
             secret_mode = st.radio(
                 "Credential Source",
@@ -141,7 +237,7 @@ with tabs[0]:
                 if secret_mode == "stored":
                     secret_value = secret
                 else:
-                    secret_value = _read_secret(secret_ref)
+                    secret_value = ui.read_secret(secret_ref)
             if auth_type != "none" and not secret_value:
                 label = "Password" if auth_type == "basic" else "Secret"
                 st.error(f"{label} is required for the selected auth type.")
@@ -167,6 +263,10 @@ with tabs[0]:
             st.error("No enabled projects available.")
         elif not name or not base_url or not index_pattern or not time_field:
             st.error("Name, base URL, index pattern, and time field are required.")
+        elif not ui.URL_RE.fullmatch(base_url):
+            st.error("Base URL must start with http:// or https:// and contain no spaces.")
+        elif not ui.INDEX_PATTERN_RE.fullmatch(index_pattern):
+            st.error("Index pattern contains characters OpenSearch does not allow.")
         elif auth_type != "none" and secret_mode == "secret_ref" and not secret_ref:
             st.error("Secret ref is required for the selected auth type.")
         elif auth_type != "none" and secret_mode == "stored" and not secret:
@@ -202,10 +302,12 @@ with tabs[0]:
                         secret_enc_param,
                         index_pattern,
                         time_field,
-                        json.dumps(query_filter),
+                        Json(query_filter),
                         enabled,
                     ),
                 )
+                _load_catalog.clear()
+                _load_monitoring_bundle.clear()
                 ui.notify("Source created.")
                 st.rerun()
             except Exception as exc:
@@ -213,11 +315,7 @@ with tabs[0]:
 
     st.markdown("### Existing Sources")
     if sources:
-        display_rows = [
-            {key: value for key, value in row.items() if key != "secret_enc"}
-            for row in sources
-        ]
-        st.dataframe(pd.DataFrame(display_rows), use_container_width=True)
+        st.dataframe(pd.DataFrame(sources), use_container_width=True)
     else:
         st.info("No OpenSearch sources configured yet.")
 
@@ -331,6 +429,7 @@ with tabs[1]:
                     updated_by,
                 ),
             )
+            _load_puller_config.clear()
             ui.notify("Puller configuration saved.")
             st.rerun()
         except Exception as exc:
@@ -344,15 +443,8 @@ with tabs[1]:
 
 with tabs[2]:
     st.markdown("### Puller Status")
-    heartbeat = db.fetch_one(
-        """
-        SELECT worker_id, worker_type, last_seen, status, details
-        FROM metadata.worker_heartbeats
-        WHERE worker_type = 'opensearch_puller'
-        ORDER BY last_seen DESC
-        LIMIT 1
-        """
-    )
+    bundle = _load_monitoring_bundle()
+    heartbeat = bundle["heartbeat"]
 
     now = ui.utc_now()
     details = (heartbeat or {}).get("details") or {}
@@ -385,50 +477,26 @@ with tabs[2]:
         st.info("No heartbeat details available yet.")
 
     st.markdown("### Ingestion Overview")
-    ingestion_rows = db.fetch_all(
-        """
-        SELECT s.source_id,
-               s.project_id,
-               s.name,
-               s.enabled,
-               i.index_name,
-               i.last_ts,
-               i.updated_at,
-               i.status,
-               i.last_error
-        FROM metadata.opensearch_sources s
-        LEFT JOIN metadata.ingestion_state i
-          ON i.source_id = s.source_id
-        ORDER BY s.project_id, s.name, i.index_name
-        """
+    ingestion_rows = bundle["ingestion_rows"]
+
+    now_ts = pd.Timestamp(now)
+    ingestion_df = pd.DataFrame.from_records(ingestion_rows, columns=_INGESTION_COLS)
+    updated_at = pd.to_datetime(ingestion_df["updated_at"], utc=True)
+    ingestion_df["age_seconds"] = (now_ts - updated_at).dt.total_seconds()
+    last_ts = pd.to_datetime(ingestion_df["last_ts"], utc=True)
+    ingestion_df["lag_minutes"] = (now_ts - last_ts).dt.total_seconds() / 60.0
+    ingestion_df["live_status"] = (
+        pd.Series("idle", index=ingestion_df.index)
+        .mask(ingestion_df["age_seconds"] <= threshold, "active")
+        .mask(ingestion_df["age_seconds"].isna(), "unknown")
+        .mask(ingestion_df["last_error"].fillna("").ne(""), "error")
     )
 
-    enriched = []
-    for row in ingestion_rows:
-        updated_at = row.get("updated_at")
-        age_seconds = (now - updated_at).total_seconds() if updated_at else None
-        lag_minutes = None
-        if row.get("last_ts"):
-            lag_minutes = (now - row["last_ts"]).total_seconds() / 60.0
-        if row.get("last_error"):
-            live_status = "error"
-        elif age_seconds is None:
-            live_status = "unknown"
-        elif age_seconds <= threshold:
-            live_status = "active"
-        else:
-            live_status = "idle"
-        row = dict(row)
-        row["age_seconds"] = age_seconds
-        row["lag_minutes"] = lag_minutes
-        row["live_status"] = live_status
-        enriched.append(row)
-
-    total_sources = len({row["source_id"] for row in ingestion_rows})
-    enabled_sources = len({row["source_id"] for row in ingestion_rows if row.get("enabled")})
-    total_indices = len([row for row in ingestion_rows if row.get("index_name")])
-    error_indices = len([row for row in enriched if row.get("live_status") == "error"])
-    active_indices = len([row for row in enriched if row.get("live_status") == "active"])
+    total_sources = bundle["source_counts"]["total_sources"]
+    enabled_sources = bundle["source_counts"]["enabled_sources"]
+    total_indices = int(ingestion_df["index_name"].fillna("").ne("").sum())
+    error_indices = int(ingestion_df["live_status"].eq("error").sum())
+    active_indices = int(ingestion_df["live_status"].eq("active").sum())
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Sources (enabled/total)", f"{enabled_sources}/{total_sources}")
@@ -438,34 +506,26 @@ with tabs[2]:
 
     project_filter = st.selectbox(
         "Project filter",
-        options=["all"] + sorted({row["project_id"] for row in ingestion_rows}),
+        options=["all"] + sorted(ingestion_df["project_id"].dropna().unique()),
         index=0,
     )
     status_filter = st.selectbox(
         "Status filter", ["all", "active", "idle", "error", "unknown"], index=0
     )
-    filtered = []
-    for row in enriched:
-        project_ok = project_filter == "all" or row["project_id"] == project_filter
-        status_ok = status_filter == "all" or row["live_status"] == status_filter
-        if project_ok and status_ok:
-            filtered.append(row)
-
-    if filtered:
-        df = pd.DataFrame(filtered)
-        st.dataframe(df, use_container_width=True)
+    mask = pd.Series(True, index=ingestion_df.index)
+    if project_filter != "all":
+        mask &= ingestion_df["project_id"].eq(project_filter)
+    if status_filter != "all":
+        mask &= ingestion_df["live_status"].eq(status_filter)
+    filtered = ingestion_df[mask]
+
+    if not filtered.empty:
+        st.dataframe(filtered, use_container_width=True)
     else:
         st.info("No ingestion rows match the filters.")
 
     st.markdown("### Backfill Queue")
-    backfill_rows = db.fetch_all(
-        """
-        SELECT job_id, source_id, start_ts, end_ts, status, last_error, updated_at
-        FROM metadata.backfill_jobs
-        ORDER BY updated_at DESC
-        LIMIT 50
-        """
-    )
+    backfill_rows = bundle["backfill_rows"]
     if backfill_rows:
         backfill_df = pd.DataFrame(backfill_rows)
         st.dataframe(backfill_df, use_container_width=True)
@@ -479,41 +539,16 @@ with tabs[2]:
         key="puller_metrics_project",
     )
     if selected_project and selected_project != "no-projects":
-        if not _is_safe_identifier(selected_project):
+        if not ui.is_identifier(selected_project):
             st.error("Project id contains unsupported characters.")
         else:
             try:
-                rows = clickhouse.query_rows(
-                    f"""
-                    SELECT count() AS events_last_hour
-                    FROM {selected_project}_bronze.os_events_raw
-                    WHERE event_ts >= now() - INTERVAL 1 HOUR
-                    """
+                events_last_hour, last_event_ts, per_source = _load_clickhouse_activity(
+                    selected_project
                 )
-                count = rows[0]["events_last_hour"] if rows else 0
-                st.metric("Events (Last Hour)", int(count))
-
-                rows = clickhouse.query_rows(
-                    f"""
-                    SELECT max(event_ts) AS last_event_ts
-                    FROM {selected_project}_bronze.os_events_raw
-                    """
-                )
-                last_event_ts = rows[0]["last_event_ts"] if rows else None
+                st.metric("Events (Last Hour)", events_last_hour)
                 st.metric("Latest Event", str(last_event_ts) if last_event_ts else "n/a")
-
-                rows = clickhouse.query_rows(
-                    f"""
-                    SELECT source_id,
-                           count() AS events_last_hour,
-                           max(event_ts) AS last_event_ts
-                    FROM {selected_project}_bronze.os_events_raw
-                    WHERE event_ts >= now() - INTERVAL 1 HOUR
-                    GROUP BY source_id
-                    ORDER BY events_last_hour DESC
-                    """
-                )
-                if rows:
-                    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+                if per_source:
+                    st.dataframe(pd.DataFrame(per_source), use_container_width=True)
             except Exception as exc:
                 st.error(f"ClickHouse query failed: {exc}")
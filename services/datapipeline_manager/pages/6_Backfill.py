@@ -1,4 +1,5 @@
-from datetime import datetime, time, timezone
+from datetime import date, datetime, time, timezone
+from typing import Optional
 
 import pandas as pd
 import streamlit as st
@@ -12,11 +13,161 @@ ui.require_auth()
 ui.sidebar()
 ui.header("Backfill Jobs", "Run historical loads safely")
 
-sources = db.fetch_all(
-    "SELECT source_id, project_id, name FROM metadata.opensearch_sources ORDER BY source_id"
-)
-source_labels = [f"{row['source_id']} | {row['project_id']} | {row['name']}" for row in sources]
-source_map = {label: row["source_id"] for label, row in zip(source_labels, sources)}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _source_labels():
+    rows = db.fetch_all(
+        "SELECT source_id, project_id, name FROM metadata.opensearch_sources ORDER BY source_id"
+    )
+    labels = [f"{row['source_id']} | {row['project_id']} | {row['name']}" for row in rows]
+    return labels, dict(zip(labels, (row["source_id"] for row in rows)))
+
+
+_JOB_FILTERS = """
+    WHERE (%s = 'all' OR j.status = %s)
+      AND (%s::bigint IS NULL OR j.source_id = %s::bigint)
+      AND (%s::date IS NULL OR (j.start_ts AT TIME ZONE 'UTC')::date >= %s::date)
+"""
+
+
+def _job_filter_params(status_filter: str, source_id: Optional[int], start_date: Optional[date]):
+    return (status_filter, status_filter, source_id, source_id, start_date, start_date)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_jobs(status_filter: str, source_id: Optional[int], start_date: Optional[date]) -> int:
+    row = db.fetch_one(
+        "SELECT COUNT(*) AS count FROM metadata.backfill_jobs j" + _JOB_FILTERS,
+        _job_filter_params(status_filter, source_id, start_date),
+    )
+    return int(row["count"]) if row else 0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_jobs(
+    status_filter: str,
+    source_id: Optional[int],
+    start_date: Optional[date],
+    limit: int,
+    offset: int,
+):
+    rows = db.fetch_all(
+        """
+        SELECT j.job_id,
+               j.source_id,
+               j.source_id || ' | ' || s.project_id || ' | ' || s.name AS source_label,
+               j.start_ts,
+               j.end_ts,
+               j.status,
+               j.last_error,
+               j.updated_at,
+               j.throttle_seconds
+        FROM metadata.backfill_jobs j
+        JOIN metadata.opensearch_sources s
+          ON s.source_id = j.source_id
+        """
+        + _JOB_FILTERS
+        + """
+        ORDER BY j.created_at DESC, j.job_id DESC
+        LIMIT %s OFFSET %s
+        """,
+        _job_filter_params(status_filter, source_id, start_date) + (limit, offset),
+    )
+    return [dict(row) for row in rows]
+
+
+def _invalidate_jobs() -> None:
+    _count_jobs.clear()
+    _search_jobs.clear()
+
+
+@st.fragment
+def _jobs_table(source_labels, source_map) -> None:
+    st.markdown("### Backfill Jobs")
+    status_filter = st.selectbox(
+        "Status filter",
+        ["all", "pending", "running", "completed", "failed", "cancelled"],
+        index=0,
+    )
+    source_filter = st.selectbox("Source filter", ["all"] + source_labels, index=0)
+    enable_date_filter = st.checkbox("Filter by start date", value=False)
+    date_filter = (
+        st.date_input("Start date (UTC)", value=datetime.utcnow().date())
+        if enable_date_filter
+        else None
+    )
+
+    source_id_filter = None if source_filter == "all" else source_map[source_filter]
+    total = _count_jobs(status_filter, source_id_filter, date_filter)
+    page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
+    total_pages = max(1, (total + page_size - 1) // page_size)
+    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="backfill_page")
+    filtered = _search_jobs(
+        status_filter, source_id_filter, date_filter, page_size, (page - 1) * page_size
+    )
+    st.dataframe(pd.DataFrame(filtered), height=400, use_container_width=True)
+
+    st.markdown("### Job Actions")
+    job_ids = [str(row["job_id"]) for row in filtered]
+    selected_job = st.selectbox("Select job", job_ids or ["none"])
+    jobs_by_id = {str(row["job_id"]): row for row in filtered}
+    job = jobs_by_id.get(selected_job)
+
+    if job:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("Cancel Job"):
+                confirm = st.checkbox("Confirm cancel", key="confirm_cancel")
+                if confirm:
+                    updated = db.prepared_fetch_one(
+                        "backfill_cancel",
+                        """
+                        UPDATE metadata.backfill_jobs
+                        SET status = 'cancelled', updated_at = now()
+                        WHERE job_id = $1
+                          AND status IN ('pending', 'running')
+                        RETURNING job_id
+                        """,
+                        (job["job_id"],),
+                    )
+                    if updated is None:
+                        st.error("Cancel skipped: job is no longer pending or running.")
+                    else:
+                        _invalidate_jobs()
+                        ui.notify("Backfill cancelled.")
+                        st.rerun()
+        with col2:
+            if st.button("Retry Failed"):
+                confirm = st.checkbox("Confirm retry", key="confirm_retry")
+                if confirm:
+                    updated = db.prepared_fetch_one(
+                        "backfill_retry",
+                        """
+                        UPDATE metadata.backfill_jobs
+                        SET status = 'pending',
+                            last_error = NULL,
+                            last_index_name = NULL,
+                            last_ts = NULL,
+                            last_sort_json = NULL,
+                            last_id = NULL,
+                            updated_at = now()
+                        WHERE job_id = $1
+                          AND status = 'failed'
+                        RETURNING job_id
+                        """,
+                        (job["job_id"],),
+                    )
+                    if updated is None:
+                        st.error("Retry skipped: job is no longer failed.")
+                    else:
+                        _invalidate_jobs()
+                        ui.notify("Backfill re-queued.")
+                        st.rerun()
+        with col3:
+            st.write(job.get("last_error") or "No error")
+
+
+source_labels, source_map = _source_labels()
 
 st.markdown("### Create Backfill Job")
 st.caption("Throttle seconds add a pause between batches during backfill.")
@@ -49,99 +200,14 @@ with st.form("create_backfill"):
                     """,
                     (
                         source_map[source_label],
-                        start_ts.isoformat(),
-                        end_ts.isoformat(),
+                        start_ts,
+                        end_ts,
                         requested_by,
                         int(throttle),
                     ),
                 )
+                _invalidate_jobs()
                 ui.notify("Backfill job queued.")
                 st.rerun()
 
-st.markdown("### Backfill Jobs")
-status_filter = st.selectbox(
-    "Status filter",
-    ["all", "pending", "running", "completed", "failed", "cancelled"],
-    index=0,
-)
-source_filter = st.selectbox("Source filter", ["all"] + source_labels, index=0)
-enable_date_filter = st.checkbox("Filter by start date", value=False)
-date_filter = (
-    st.date_input("Start date (UTC)", value=datetime.utcnow().date())
-    if enable_date_filter
-    else None
-)
-
-jobs = db.fetch_all(
-    """
-    SELECT job_id, source_id, start_ts, end_ts, status, last_error, updated_at, throttle_seconds
-    FROM metadata.backfill_jobs
-    ORDER BY created_at DESC
-    """
-)
-
-filtered = []
-for row in jobs:
-    status_ok = status_filter == "all" or row["status"] == status_filter
-    source_ok = True
-    if source_filter != "all":
-        source_ok = str(row["source_id"]) == source_filter.split("|", 1)[0].strip()
-    date_ok = True
-    if date_filter:
-        date_ok = row["start_ts"].date() >= date_filter
-    if status_ok and source_ok and date_ok:
-        filtered.append(row)
-
-df = pd.DataFrame(filtered)
-page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
-total_pages = max(1, (len(df) + page_size - 1) // page_size)
-page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="backfill_page")
-start = (page - 1) * page_size
-end = start + page_size
-st.dataframe(df.iloc[start:end] if not df.empty else df, use_container_width=True)
-
-st.markdown("### Job Actions")
-job_ids = [str(row["job_id"]) for row in filtered]
-selected_job = st.selectbox("Select job", job_ids or ["none"])
-job = next((row for row in jobs if str(row["job_id"]) == selected_job), None)
-
-if job:
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        if st.button("Cancel Job"):
-            confirm = st.checkbox("Confirm cancel", key="confirm_cancel")
-            if confirm:
-                db.execute(
-                    """
-                    UPDATE metadata.backfill_jobs
-                    SET status = 'cancelled', updated_at = now()
-                    WHERE job_id = %s
-                      AND status IN ('pending', 'running')
-                    """,
-                    (job["job_id"],),
-                )
-                ui.notify("Backfill cancelled.")
-                st.rerun()
-    with col2:
-        if st.button("Retry Failed"):
-            confirm = st.checkbox("Confirm retry", key="confirm_retry")
-            if confirm:
-                db.execute(
-                    """
-                    UPDATE metadata.backfill_jobs
-                    SET status = 'pending',
-                        last_error = NULL,
-                        last_index_name = NULL,
-                        last_ts = NULL,
-                        last_sort_json = NULL,
-                        last_id = NULL,
-                        updated_at = now()
-                    WHERE job_id = %s
-                      AND status = 'failed'
-                    """,
-                    (job["job_id"],),
-                )
-                ui.notify("Backfill re-queued.")
-                st.rerun()
-    with col3:
-        st.write(job.get("last_error") or "No error")
+_jobs_table(source_labels, source_map)
@@ -1,4 +1,6 @@
 import re
+from typing import Optional
+
 import pandas as pd
 import streamlit as st
 
@@ -12,19 +14,89 @@ ui.require_auth()
 ui.sidebar()
 ui.header("Field Registry", "Schema evolution and derived fields")
 
-IDENT_RE = re.compile(r"^[A-Za-z0-9_]+$")
-
-projects = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
-project_ids = [row["project_id"] for row in projects]
+TABLE_RE = re.compile(r"[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)?")
+_RESULTS_PREVIEW_ROWS = 100
 
-fields = db.fetch_all(
-    """
+_FIELD_COLUMNS = """
     SELECT field_id, project_id, dataset, layer, table_name, column_name, column_type,
            expression_sql, mode, enabled, created_at, updated_at
     FROM metadata.field_registry
-    ORDER BY field_id
-    """
-)
+"""
+
+_FIELD_RETURNING = """
+    RETURNING field_id, project_id, dataset, layer, table_name, column_name, column_type,
+              expression_sql, mode, enabled, created_at, updated_at
+"""
+
+_FIELD_FILTERS = """
+    WHERE (%s = 'all' OR project_id = %s)
+      AND (%s = 'all' OR layer = %s)
+      AND (%s = 'all' OR enabled = %s)
+"""
+
+
+def _field_filter_params(project_filter: str, layer_filter: str, status_filter: str):
+    return (
+        project_filter,
+        project_filter,
+        layer_filter,
+        layer_filter,
+        status_filter,
+        status_filter == "enabled",
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_fields(project_filter: str, layer_filter: str, status_filter: str) -> int:
+    row = db.fetch_one(
+        "SELECT COUNT(*) AS count FROM metadata.field_registry" + _FIELD_FILTERS,
+        _field_filter_params(project_filter, layer_filter, status_filter),
+    )
+    return int(row["count"]) if row else 0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_fields(project_filter: str, layer_filter: str, status_filter: str, limit: int, offset: int):
+    rows = db.fetch_all(
+        _FIELD_COLUMNS
+        + _FIELD_FILTERS
+        + """
+        ORDER BY field_id
+        LIMIT %s OFFSET %s
+        """,
+        _field_filter_params(project_filter, layer_filter, status_filter) + (limit, offset),
+    )
+    return [dict(row) for row in rows]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_field(field_id: int):
+    row = db.fetch_one(_FIELD_COLUMNS + " WHERE field_id = %s", (field_id,))
+    return dict(row) if row else None
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_project_ids():
+    rows = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
+    return [row["project_id"] for row in rows]
+
+
+def _validate_field(column_name: str, table_name: str) -> Optional[str]:
+    if not ui.is_identifier(column_name):
+        return "Column name must be alphanumeric + underscore."
+    if not TABLE_RE.fullmatch(table_name):
+        return "Table name must be alphanumeric + underscore, optionally schema.table."
+    return None
+
+
+def _invalidate_fields() -> None:
+    _count_fields.clear()
+    _search_fields.clear()
+    _load_field.clear()
+
+
+project_ids = _load_project_ids()
+project_index = {pid: i for i, pid in enumerate(project_ids)}
 
 st.markdown("### Create Field Mapping")
 with st.form("create_field"):
@@ -40,14 +112,9 @@ with st.form("create_field"):
     submitted = st.form_submit_button("Add Field")
     if submitted:
         project_id = None if project_scope == "global" else project_scope
-        if not column_name or not IDENT_RE.match(column_name):
-            st.error("Column name must be alphanumeric + underscore.")
-        elif "." in table_name:
-            parts = table_name.split(".", 1)
-            if not IDENT_RE.match(parts[0]) or not IDENT_RE.match(parts[1]):
-                st.error("Table name parts must be alphanumeric + underscore.")
-        elif not IDENT_RE.match(table_name):
-            st.error("Table name must be alphanumeric + underscore.")
+        error = _validate_field(column_name, table_name)
+        if error:
+            st.error(error)
         else:
             db.execute(
                 """
@@ -68,6 +135,7 @@ with st.form("create_field"):
                     enabled,
                 ),
             )
+            _invalidate_fields()
             ui.notify("Field registered.")
             st.rerun()
 
@@ -76,39 +144,27 @@ project_filter = st.selectbox("Filter by project", ["all"] + project_ids, index=
 layer_filter = st.selectbox("Filter by layer", ["all", "bronze", "gold_fact", "gold_dim"], index=0)
 status_filter = st.selectbox("Filter by status", ["all", "enabled", "disabled"], index=0)
 
-filtered = []
-for row in fields:
-    project_ok = project_filter == "all" or row["project_id"] == project_filter
-    layer_ok = layer_filter == "all" or row["layer"] == layer_filter
-    status_ok = (
-        status_filter == "all"
-        or (status_filter == "enabled" and row["enabled"])
-        or (status_filter == "disabled" and not row["enabled"])
-    )
-    if project_ok and layer_ok and status_ok:
-        filtered.append(row)
-
-df = pd.DataFrame(filtered)
+total = _count_fields(project_filter, layer_filter, status_filter)
 page_size = st.selectbox("Rows per page", [10, 20, 50], index=1)
-total_pages = max(1, (len(df) + page_size - 1) // page_size)
+total_pages = max(1, (total + page_size - 1) // page_size)
 page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="field_page")
-start = (page - 1) * page_size
-end = start + page_size
-st.dataframe(df.iloc[start:end] if not df.empty else df, use_container_width=True)
+filtered = _search_fields(
+    project_filter, layer_filter, status_filter, page_size, (page - 1) * page_size
+)
+st.dataframe(pd.DataFrame(filtered), height=400, use_container_width=True)
 
 st.markdown("### Field Actions")
 field_ids = [str(row["field_id"]) for row in filtered]
 selected = st.selectbox("Select field", field_ids or ["none"])
-current = next((row for row in fields if str(row["field_id"]) == selected), None)
+current = (
+    ui.fresh_row("fields_cache", int(selected), _load_field(int(selected)))
+    if selected != "none"
+    else None
+)
 
 if current:
     with st.form("edit_field"):
-        if current["project_id"] is None:
-            scope_index = 0
-        elif current["project_id"] in project_ids:
-            scope_index = project_ids.index(current["project_id"]) + 1
-        else:
-            scope_index = 0
+        scope_index = project_index.get(current["project_id"], -1) + 1
         project_scope = st.selectbox(
             "Project Scope",
             ["global"] + project_ids,
@@ -130,16 +186,11 @@ if current:
         submitted = st.form_submit_button("Update Field")
         if submitted:
             project_id = None if project_scope == "global" else project_scope
-            if not column_name or not IDENT_RE.match(column_name):
-                st.error("Column name must be alphanumeric + underscore.")
-            elif "." in table_name:
-                parts = table_name.split(".", 1)
-                if not IDENT_RE.match(parts[0]) or not IDENT_RE.match(parts[1]):
-                    st.error("Table name parts must be alphanumeric + underscore.")
-            elif not IDENT_RE.match(table_name):
-                st.error("Table name must be alphanumeric + underscore.")
+            error = _validate_field(column_name, table_name)
+            if error:
+                st.error(error)
             else:
-                rowcount = db.execute(
+                updated = db.fetch_one(
                     """
                     UPDATE metadata.field_registry
                     SET project_id = %s,
@@ -154,7 +205,8 @@ if current:
                         updated_at = now()
                     WHERE field_id = %s
                       AND updated_at = %s
-                    """,
+                    """
+                    + _FIELD_RETURNING,
                     (
                         project_id,
                         dataset,
@@ -169,9 +221,12 @@ if current:
                         current["updated_at"],
                     ),
                 )
-                if rowcount == 0:
+                if updated is None:
                     st.error("Update conflict: field was modified by another user.")
                 else:
+                    ui.remember_row("fields_cache", updated["field_id"], dict(updated))
+                    _count_fields.clear()
+                    _search_fields.clear()
                     ui.notify("Field updated.")
                     st.rerun()
 
@@ -180,17 +235,24 @@ if current:
         if st.button("Enable / Disable"):
             confirm = st.checkbox("Confirm toggle", key="confirm_field_toggle")
             if confirm:
-                db.execute(
+                updated = db.fetch_one(
                     """
                     UPDATE metadata.field_registry
                     SET enabled = %s, updated_at = now()
                     WHERE field_id = %s
                       AND updated_at = %s
-                    """,
+                    """
+                    + _FIELD_RETURNING,
                     (not current["enabled"], current["field_id"], current["updated_at"]),
                 )
-                ui.notify("Field status updated.")
-                st.rerun()
+                if updated is None:
+                    st.error("Update conflict: field was modified by another user.")
+                else:
+                    ui.remember_row("fields_cache", updated["field_id"], dict(updated))
+                    _count_fields.clear()
+                    _search_fields.clear()
+                    ui.notify("Field status updated.")
+                    st.rerun()
     with col2:
         if st.button("Delete Field"):
             confirm = st.checkbox("Confirm delete", key="confirm_field_delete")
@@ -199,14 +261,26 @@ if current:
                     "DELETE FROM metadata.field_registry WHERE field_id = %s",
                     (current["field_id"],),
                 )
+                st.session_state.get("fields_cache", {}).pop(current["field_id"], None)
+                _invalidate_fields()
                 ui.notify("Field deleted.")
                 st.rerun()
 
 st.markdown("### Apply Schema Changes")
 if st.button("Apply Schema Changes"):
-    results = apply_schema(collect_results=True)
+    st.session_state["_field_apply_results"] = apply_schema(collect_results=True) or []
     ui.notify("Schema migration completed.")
+if "_field_apply_results" in st.session_state:
+    results = st.session_state["_field_apply_results"]
     if results:
-        st.dataframe(pd.DataFrame(results), use_container_width=True)
+        st.dataframe(pd.DataFrame(results[:_RESULTS_PREVIEW_ROWS]), use_container_width=True)
+        if len(results) > _RESULTS_PREVIEW_ROWS:
+            st.caption(f"Showing first {_RESULTS_PREVIEW_ROWS} of {len(results)} results.")
+            st.download_button(
+                "Download full results",
+                pd.DataFrame(results).to_csv(index=False),
+                file_name="schema_apply_results.csv",
+                mime="text/csv",
+            )
     else:
         st.info("No field registry entries to apply.")
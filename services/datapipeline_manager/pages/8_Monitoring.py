@@ -11,24 +11,45 @@ ui.sidebar()
 ui.header("Monitoring & Status", "Ingestion health and operational metrics")
 
 
-def _worker_status():
-    heartbeat = db.fetch_one(
+def _load_heartbeats():
+    return db.fetch_one(
         """
-        SELECT worker_id, worker_type, last_seen, status, details
-        FROM metadata.worker_heartbeats
-        WHERE worker_type = 'opensearch_puller'
-        ORDER BY last_seen DESC
-        LIMIT 1
+        WITH puller AS (
+          SELECT last_seen, status, details
+          FROM metadata.worker_heartbeats
+          WHERE worker_type = 'opensearch_puller'
+          ORDER BY last_seen DESC
+          LIMIT 1
+        ), latest AS (
+          SELECT last_seen
+          FROM metadata.worker_heartbeats
+          ORDER BY last_seen DESC
+          LIMIT 1
+        )
+        SELECT puller.last_seen AS puller_last_seen,
+               puller.status AS puller_status,
+               puller.details AS puller_details,
+               latest.last_seen AS latest_last_seen,
+               (
+                 SELECT MAX(updated_at)
+                 FROM metadata.ingestion_state
+                 WHERE status = 'idle'
+               ) AS last_success
+        FROM (SELECT 1) AS one
+        LEFT JOIN puller ON true
+        LEFT JOIN latest ON true
         """
     )
-    if not heartbeat:
+
+
+def _worker_status(heartbeats, now):
+    last_seen = heartbeats.get("puller_last_seen")
+    if not last_seen:
         return {"status": "unknown", "last_seen": None, "age_seconds": None}
 
-    now = ui.utc_now()
-    last_seen = heartbeat.get("last_seen")
-    age_seconds = (now - last_seen).total_seconds() if last_seen else None
+    age_seconds = (now - last_seen).total_seconds()
 
-    details = heartbeat.get("details") or {}
+    details = heartbeats.get("puller_details") or {}
     poll_interval = details.get("poll_interval")
     try:
         poll_interval = int(poll_interval) if poll_interval is not None else None
@@ -36,12 +57,10 @@ def _worker_status():
         poll_interval = None
 
     threshold = max(60, (poll_interval or 30) * 2)
-    if age_seconds is None:
-        status = "unknown"
-    elif age_seconds > threshold:
+    if age_seconds > threshold:
         status = "stale"
     else:
-        status = heartbeat.get("status") or "idle"
+        status = heartbeats.get("puller_status") or "idle"
 
     return {
         "status": status,
@@ -52,8 +71,90 @@ def _worker_status():
     }
 
 
+_INGESTION_COLS = (
+    "source_id",
+    "project_id",
+    "name",
+    "index_name",
+    "last_ts",
+    "updated_at",
+    "status",
+    "last_error",
+)
+_STATUS_DISPLAY_COLS = (
+    "source_id",
+    "project_id",
+    "name",
+    "index_name",
+    "status",
+    "age_seconds",
+    "lag_minutes",
+    "last_error",
+)
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _load_ingestion_rows():
+    rows = db.fetch_all(
+        """
+        SELECT s.source_id,
+               s.project_id,
+               s.name,
+               i.index_name,
+               i.last_ts,
+               i.updated_at,
+               i.status,
+               i.last_error
+        FROM metadata.opensearch_sources s
+        LEFT JOIN metadata.ingestion_state i
+          ON i.source_id = s.source_id
+        ORDER BY s.project_id, s.name
+        """
+    )
+    return [dict(row) for row in rows]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_project_ids():
+    rows = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
+    return [row["project_id"] for row in rows]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _source_project_ids():
+    rows = db.fetch_all(
+        "SELECT DISTINCT project_id FROM metadata.opensearch_sources ORDER BY project_id"
+    )
+    return [row["project_id"] for row in rows]
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _events_last_hour(project_id: str) -> int:
+    rows = clickhouse.query_rows(
+        """
+        SELECT count() AS events_last_hour
+        FROM {bronze_db:Identifier}.os_events_raw
+        WHERE event_ts >= now() - INTERVAL 1 HOUR
+        """,
+        params={"bronze_db": f"{project_id}_bronze"},
+    )
+    return int(rows[0]["events_last_hour"]) if rows else 0
+
+
+prefetch_project = st.session_state.get("metrics_project")
+pool = ui.query_executor()
+heartbeats_future = pool.submit(_load_heartbeats)
+rows_future = pool.submit(_load_ingestion_rows)
+source_project_ids_future = pool.submit(_source_project_ids)
+project_ids_future = pool.submit(_load_project_ids)
+events_future = None
+if prefetch_project and prefetch_project != "no-projects":
+    events_future = pool.submit(_events_last_hour, prefetch_project)
+
 st.markdown("### Puller Status")
-worker = _worker_status()
+now = ui.utc_now()
+heartbeats = heartbeats_future.result() or {}
+worker = _worker_status(heartbeats, now)
 activity_threshold = worker.get("threshold") or 60
 if worker["last_seen"]:
     st.metric("OpenSearch Puller", worker["status"], worker["last_seen"].isoformat())
@@ -61,62 +162,39 @@ else:
     st.metric("OpenSearch Puller", worker["status"])
 
 st.markdown("### Ingestion Status")
-rows = db.fetch_all(
-    """
-    SELECT s.source_id,
-           s.project_id,
-           s.name,
-           i.index_name,
-           i.last_ts,
-           i.updated_at,
-           i.status,
-           i.last_error
-    FROM metadata.opensearch_sources s
-    LEFT JOIN metadata.ingestion_state i
-      ON i.source_id = s.source_id
-    ORDER BY s.project_id, s.name
-    """
-)
+rows = rows_future.result()
 
 project_filter = st.selectbox(
-    "Project filter", ["all"] + sorted({r["project_id"] for r in rows}), index=0
+    "Project filter", ["all"] + source_project_ids_future.result(), index=0
 )
 status_filter = st.selectbox(
     "Status filter", ["all", "active", "idle", "error", "unknown"], index=0
 )
 
-filtered = []
-now = ui.utc_now()
-for row in rows:
-    project_ok = project_filter == "all" or row["project_id"] == project_filter
-    raw_status = row.get("status") or "idle"
-    row["raw_status"] = raw_status
-    updated_at = row.get("updated_at")
-    age_seconds = (now - updated_at).total_seconds() if updated_at else None
-    row["age_seconds"] = age_seconds
-    if row.get("last_ts"):
-        row["lag_minutes"] = (now - row["last_ts"]).total_seconds() / 60.0
-    else:
-        row["lag_minutes"] = None
-    if raw_status == "error" or row.get("last_error"):
-        live_status = "error"
-    elif age_seconds is None:
-        live_status = "unknown"
-    elif age_seconds <= activity_threshold:
-        live_status = "active"
-    else:
-        live_status = "idle"
-    row["status"] = live_status
-    status_ok = status_filter == "all" or live_status == status_filter
-    if project_ok and status_ok:
-        filtered.append(row)
-
-df = pd.DataFrame(filtered)
-st.dataframe(df, use_container_width=True)
+now_ts = pd.Timestamp(now)
+df = pd.DataFrame.from_records(rows, columns=_INGESTION_COLS)
+raw_status = df["status"].fillna("")
+df["raw_status"] = raw_status.where(raw_status != "", "idle")
+df["age_seconds"] = (now_ts - pd.to_datetime(df["updated_at"], utc=True)).dt.total_seconds()
+df["lag_minutes"] = (now_ts - pd.to_datetime(df["last_ts"], utc=True)).dt.total_seconds() / 60.0
+has_last_error = df["last_error"].fillna("").ne("")
+has_error = df["raw_status"].eq("error") | has_last_error
+df["status"] = (
+    pd.Series("idle", index=df.index)
+    .mask(df["age_seconds"] <= activity_threshold, "active")
+    .mask(df["age_seconds"].isna(), "unknown")
+    .mask(has_error, "error")
+)
+mask = pd.Series(True, index=df.index)
+if project_filter != "all":
+    mask &= df["project_id"].eq(project_filter)
+if status_filter != "all":
+    mask &= df["status"].eq(status_filter)
+df = df[mask]
+st.dataframe(df[list(_STATUS_DISPLAY_COLS)], use_container_width=True)
 
 st.markdown("### Operational Metrics")
-projects = db.fetch_all("SELECT project_id FROM metadata.projects ORDER BY project_id")
-project_ids = [row["project_id"] for row in projects]
+project_ids = project_ids_future.result()
 selected_project = st.selectbox(
     "Project for metrics", options=project_ids or ["no-projects"], key="metrics_project"
 )
@@ -125,43 +203,26 @@ col1, col2 = st.columns(2)
 with col1:
     if selected_project and selected_project != "no-projects":
         try:
-            rows = clickhouse.query_rows(
-                f"""
-                SELECT count() AS events_last_hour
-                FROM {selected_project}_bronze.os_events_raw
-                WHERE event_ts >= now() - INTERVAL 1 HOUR
-                """
-            )
-            count = rows[0]["events_last_hour"] if rows else 0
-            st.metric("Events (Last Hour)", int(count))
+            if events_future is not None and selected_project == prefetch_project:
+                events_last_hour = events_future.result()
+            else:
+                events_last_hour = _events_last_hour(selected_project)
+            st.metric("Events (Last Hour)", events_last_hour)
         except Exception as exc:
             st.error(f"ClickHouse query failed: {exc}")
 with col2:
-    try:
-        heartbeat = db.fetch_one(
-            """
-            SELECT worker_id, worker_type, last_seen, status
-            FROM metadata.worker_heartbeats
-            ORDER BY last_seen DESC
-            LIMIT 1
-            """
-        )
-        if heartbeat:
-            st.metric("Worker Heartbeat", heartbeat["last_seen"].isoformat())
-        else:
-            st.info("No heartbeat data yet.")
-    except Exception:
-        st.info("Heartbeat table not available.")
+    if heartbeats.get("latest_last_seen"):
+        st.metric("Worker Heartbeat", heartbeats["latest_last_seen"].isoformat())
+    else:
+        st.info("No heartbeat data yet.")
 
 st.markdown("### Last Successful Batch")
-last_success = db.fetch_one(
-    "SELECT MAX(updated_at) AS last_success FROM metadata.ingestion_state WHERE status = 'idle'"
-)
-if last_success and last_success.get("last_success"):
-    st.metric("Last Successful Batch", last_success["last_success"].isoformat())
+if heartbeats.get("last_success"):
+    st.metric("Last Successful Batch", heartbeats["last_success"].isoformat())
 else:
     st.info("No successful batches recorded yet.")
 
 st.markdown("### Recent Errors")
-error_rows = [row for row in filtered if row.get("last_error")]
-st.dataframe(pd.DataFrame(error_rows), use_container_width=True)
+st.dataframe(
+    df.loc[has_last_error[mask], list(_STATUS_DISPLAY_COLS)], use_container_width=True
+)
@@ -14,11 +14,20 @@ ui.sidebar()
 ui.header("User Access", "Create and manage UI users with access levels")
 ui.ensure_user_store()
 
+USERNAME_RE = re.compile(r"[A-Za-z0-9_.-]{3,32}")
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _list_users():
+    return [dict(user) for user in ui.list_users()]
+
+
 st.markdown("### Current Users")
-users = ui.list_users()
-if users:
-    df = pd.DataFrame(users)
-    st.dataframe(df, use_container_width=True)
+users = _list_users()
+if users and len(users) < 50:
+    st.table(users)
+elif users:
+    st.dataframe(pd.DataFrame(users), use_container_width=True)
 else:
     st.info("No users yet. Create the first user below.")
 
@@ -33,7 +42,7 @@ with st.form("create_user"):
     submitted = st.form_submit_button("Create user")
 
     if submitted:
-        if not re.fullmatch(r"[A-Za-z0-9_.-]{3,32}", username or ""):
+        if not USERNAME_RE.fullmatch(username or ""):
             st.error("Username format is invalid.")
         elif password != confirm:
             st.error("Passwords do not match.")
@@ -44,6 +53,7 @@ with st.form("create_user"):
         else:
             try:
                 ui.create_user(username, password, role=role, enabled=enabled)
+                _list_users.clear()
                 ui.notify("User created.")
                 st.rerun()
             except Exception as exc:
@@ -58,9 +68,6 @@ else:
     current = next((user for user in users if user["username"] == selected), None)
     if current:
         current_user = st.session_state.get("username")
-        admin_count = sum(
-            1 for user in users if user["role"] == "admin" and user["enabled"]
-        )
         with st.form("edit_user"):
             role_options = list(ui.ROLE_OPTIONS)
             role_index = role_options.index(current["role"]) if current["role"] in role_options else 0
@@ -78,8 +85,9 @@ else:
                     st.error("You cannot disable your own account.")
                 elif (
                     current["role"] == "admin"
-                    and admin_count == 1
+                    and current["enabled"]
                     and (role != "admin" or not enabled)
+                    and ui.count_enabled_admins() <= 1
                 ):
                     st.error("At least one enabled admin is required.")
                 elif password and password != confirm:
@@ -92,7 +100,8 @@ else:
                         if password:
                             ui.reset_password(selected, password)
                         if selected == current_user:
-                            st.session_state["role"] = role
+                            ui.set_session_role(role)
+                        _list_users.clear()
                         ui.notify("User updated.")
                         st.rerun()
                     except Exception as exc: